@@ -1,7 +1,21 @@
 import math
+import os
 import numpy as np # type: ignore
+from rng import streams
+
 from to_be_optimized import rotate_point, left_right, turn
 
+# The compiled Ant from optimized.pyx is used when built (see setup.py);
+# ANT_BACKEND=python forces the pure-Python one. This class always runs the
+# pure-Python kernels and stays available as `PythonAnt`.
+BACKEND = "python"
+if os.environ.get("ANT_BACKEND", "cython") == "cython":
+    try:
+        import optimized # type: ignore
+        BACKEND = "cython"
+    except ImportError:
+        pass
+
 x_offsets0 = np.array([-5, -7.5, -4.5, 5, 7.5, 4.5])
 y_offsets0 = np.array([4, 10, 16])
 
@@ -27,13 +41,21 @@ class Ant:
         dir: int | float | None = None, 
         target: tuple[int | float, int | float] | None = None, 
         WIDTH: int = WIDTH, 
-        HEIGHT: int = HEIGHT
+        HEIGHT: int = HEIGHT,
+        stream: int | None = None
     ) -> None:
-        self.x = np.random.randint(0, WIDTH) if x == None else x
-        self.y = np.random.randint(0, HEIGHT) if y == None else y
+        # Random stream id; draw 0 spawns the ant, every later draw is a new target
+        self.stream = int(streams.spawn(1)[0]) if stream == None else stream
+        self.draws = 1
+        spawn_x, spawn_y, spawn_dir, target_x, target_y = streams.spawn_state(self.stream, WIDTH, HEIGHT)[0].tolist()
+
+        self.x = spawn_x if x == None else x
+        self.y = spawn_y if y == None else y
         self.speed = 0.5 if speed == None else speed
-        self.dir = np.random.randint(0,360) if dir == None else dir
-        self.target = (np.random.randint(0, WIDTH), np.random.randint(0, HEIGHT)) if target == None else target
+        self.dir = spawn_dir if dir == None else dir
+        self.target = (target_x, target_y) if target == None else target
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
 
         self.rotation_speed = 0
 
@@ -83,12 +105,11 @@ class Ant:
             apos = np.array(pos)
             aideal = np.array(ideal)
             sq1 = np.sum(np.square(apos - aideal))
-            sq2 = np.sum(np.square(np.array(pos) - np.array([x0, y0])))
+            sq2 = np.sum(np.square(apos - (x0, y0)))
 
             if self.feet_frames[i] > 0:
-                positions = apos + (aideal - apos) * eased_t[:, None]
-
-                pos = positions[self.feet_frames[i] - 1]
+                # Only the current row of the eased interpolation is needed
+                pos = apos + (aideal - apos) * eased_t[self.feet_frames[i] - 1]
                 self.feet_frames[i] += 1
 
                 if self.feet_frames[i] > interpolation_frames:
@@ -103,7 +124,8 @@ class Ant:
 
     def update(self):
         if np.sum(np.square(np.array(self.target) - np.array([self.x, self.y]))) < 4:
-            self.target = (np.random.randint(50, WIDTH-49), np.random.randint(50, HEIGHT-49))
+            self.target = tuple(streams.targets(self.stream, self.draws, self.WIDTH, self.HEIGHT)[0].tolist())
+            self.draws += 1
 
         left, right = left_right(self.x, self.y, self.target, self.dir)
 
@@ -142,3 +164,7 @@ class Ant:
                 self.feet_positions[i][0] = (x, y)
         '''
 
+# The compiled class steps identically (`python -m bench --parity`); the pure-Python one stays available
+PythonAnt = Ant
+if BACKEND == "cython":
+    from optimized import Ant # type: ignore
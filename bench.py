@@ -0,0 +1,250 @@
+"""Benchmarks for the pure-Python and Cython kernels and for a full colony tick.
+
+    python -m bench --out bench.json
+    python -m bench --sizes 1 100 10000 --compare bench.json
+    python -m bench --parity
+
+Every fixture is built from a fixed seed, so two runs on different commits
+time exactly the same work. Results are written as JSON. `--parity` checks
+that the pure-Python and Cython backends produce identical trajectories.
+Set ANT_BACKEND=python for a baseline without any compiled code.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np # type: ignore
+
+import ant as py_ant
+import to_be_optimized as py_kernels
+from colony import AntColony, colony_step
+import rng
+
+if py_ant.BACKEND == "cython":
+    import optimized as cy_kernels # type: ignore
+else:
+    cy_kernels = None
+
+SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+SEED = 1234
+
+def _time(func, repeats: int, budget: float) -> list[float]:
+    """Run `func` up to `repeats` times (at least once) within `budget` seconds."""
+    timings = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < repeats:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    return timings
+
+def _ants(cls, size: int) -> list:
+    np.random.seed(SEED)
+    rng.seed(SEED)
+    xs = np.random.uniform(0, py_ant.WIDTH, size)
+    ys = np.random.uniform(0, py_ant.HEIGHT, size)
+    dirs = np.random.uniform(0, 360, size)
+    targets = np.random.uniform(0, (py_ant.WIDTH, py_ant.HEIGHT), (size, 2))
+    return [
+        cls(x=float(x), y=float(y), dir=float(d), target=(float(tx), float(ty)))
+        for x, y, d, (tx, ty) in zip(xs, ys, dirs, targets)
+    ]
+
+def _segments(size: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(SEED)
+    return rng.uniform(0, 1000, (size, 2)), rng.uniform(0, 1000, (size, 2))
+
+def micro_cases(kernels, cls, size: int, objects: bool):
+    """Yield (name, callable) pairs for one backend at one population size."""
+    p1, p2 = _segments(size)
+    yield "anti_aliase_line_coords", lambda: kernels.anti_aliase_line_coords(p1, p2, 2.0)
+
+    if not objects:
+        return
+
+    ants = _ants(cls, size)
+    states = [(a.x, a.y, a.target, a.dir) for a in ants]
+
+    def rotate_point():
+        for x, y, _, d in states:
+            kernels.rotate_point(x + 5, y + 5, x, y, d)
+
+    def left_right():
+        for x, y, target, d in states:
+            kernels.left_right(x, y, target, d)
+
+    def turn():
+        for a in ants:
+            kernels.turn(a, True, False, py_ant.max_rotation_speed)
+
+    def update_feet():
+        for a in ants:
+            a.update_feet()
+
+    yield "rotate_point", rotate_point
+    yield "left_right", left_right
+    yield "turn", turn
+    yield "update_feet", update_feet
+
+def macro_cases(size: int, objects: bool):
+    """Yield (name, backend, callable) pairs for one full tick of the whole population."""
+    rng.seed(SEED)
+    colony = AntColony(size)
+    yield "colony_tick", "colony", colony.step
+
+    if not objects:
+        return
+
+    for backend, cls in (("python", py_ant.PythonAnt), ("cython", cy_kernels and cy_kernels.Ant)):
+        if cls is None:
+            continue
+        ants = _ants(cls, size)
+
+        def tick(ants=ants):
+            for a in ants:
+                a.update()
+
+        yield "colony_tick", backend, tick
+
+def run(sizes: list[int], repeats: int, budget: float, max_objects: int) -> list[dict]:
+    results = []
+
+    def record(kind, name, backend, size, func):
+        timings = _time(func, repeats, budget)
+        best = min(timings)
+        results.append({
+            "kind": kind,
+            "name": name,
+            "backend": backend,
+            "size": size,
+            "repeats": len(timings),
+            "best_s": best,
+            "mean_s": sum(timings) / len(timings),
+            "per_item_ns": best / size * 1e9,
+        })
+        print(f"{kind:5} {name:24} {backend:7} {size:>7}  {best * 1e3:10.3f} ms  {best / size * 1e9:10.1f} ns/ant")
+
+    backends = [("python", py_kernels, py_ant.PythonAnt)]
+    if cy_kernels is not None:
+        backends.append(("cython", cy_kernels, cy_kernels.Ant))
+
+    for size in sizes:
+        # Per-object loops get very slow past a few thousand ants; only the array paths scale further
+        objects = size <= max_objects
+        for backend, kernels, cls in backends:
+            for name, func in micro_cases(kernels, cls, size, objects):
+                record("micro", name, backend, size, func)
+        for name, backend, func in macro_cases(size, objects):
+            record("macro", name, backend, size, func)
+
+    return results
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cython_backend": cy_kernels is not None,
+        # Which path the "colony" rows stepped: the compiled colony_step kernel or NumPy
+        "colony_kernel": "numpy" if colony_step is None else "colony_step",
+        "seed": SEED,
+    }
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """Print the speed ratio of each result against a previously saved run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    key = lambda r: (r["kind"], r["name"], r["backend"], r["size"])
+    old = {key(r): r for r in baseline["results"]}
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit')}):")
+    for r in results:
+        prev = old.get(key(r))
+        if prev is None:
+            continue
+        ratio = prev["best_s"] / r["best_s"]
+        print(f"{r['kind']:5} {r['name']:24} {r['backend']:7} {r['size']:>7}  {ratio:6.2f}x")
+
+def trajectory(count: int, ticks: int) -> np.ndarray:
+    """(ticks, count, 27) x, y, dir, feet and hips of seeded `ant.Ant`s, on whichever backend ant.py selected."""
+    rng.seed(SEED)
+    ants = [py_ant.Ant() for _ in range(count)]
+    out = np.empty((ticks, count, 27))
+    for t in range(ticks):
+        for i, a in enumerate(ants):
+            a.update()
+            out[t, i, :3] = a.x, a.y, a.dir
+            out[t, i, 3:15] = np.ravel(a.feet_positions)
+            out[t, i, 15:] = np.ravel(a.hip_positions)
+    return out
+
+def parity(count: int, ticks: int) -> bool:
+    """Run the same seeded ants on both backends, each in a fresh interpreter, and compare every tick exactly."""
+    runs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("python", "cython"):
+            path = os.path.join(tmp, f"{backend}.npz")
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--trajectory", path,
+                 "--parity-ants", str(count), "--parity-ticks", str(ticks)],
+                env={**os.environ, "ANT_BACKEND": backend}, check=True,
+            )
+            with np.load(path) as data:
+                if str(data["backend"]) != backend:
+                    print(f"{backend} backend is not available; build it with `python setup.py build_ext --inplace`")
+                    return False
+                runs[backend] = data["trajectory"]
+
+    python, cython = runs["python"], runs["cython"]
+    mismatch = np.flatnonzero((python != cython).any(axis=(1, 2)))
+    if mismatch.size:
+        t = mismatch[0]
+        print(f"backends diverge at tick {t}: max difference {np.abs(python[t] - cython[t]).max():.3g}")
+        return False
+    print(f"python and cython backends match exactly over {ticks} ticks of {count} ants")
+    return True
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ant kernels and colony tick.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="population sizes")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--budget", type=float, default=2.0, help="max seconds spent per case")
+    parser.add_argument("--max-objects", type=int, default=10_000, help="largest size for per-Ant-object cases")
+    parser.add_argument("--out", default=None, help="write results to this JSON file")
+    parser.add_argument("--compare", default=None, help="JSON file from a previous run to compare against")
+    parser.add_argument("--parity", action="store_true", help="check that both backends step identically, then exit")
+    parser.add_argument("--parity-ants", type=int, default=100, help="ants in the parity run")
+    parser.add_argument("--parity-ticks", type=int, default=1000, help="ticks in the parity run")
+    parser.add_argument("--trajectory", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.trajectory:
+        np.savez(args.trajectory, backend=py_ant.BACKEND, trajectory=trajectory(args.parity_ants, args.parity_ticks))
+        return
+    if args.parity:
+        sys.exit(0 if parity(args.parity_ants, args.parity_ticks) else 1)
+
+    results = run(args.sizes, args.repeats, args.budget, args.max_objects)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import pygame  # type: ignore
+import numpy as np  # type: ignore
 
 class Camera:
     def __init__(self, world_size, screen_size, border_margin=50, scale=1.0, max_scale=5.0, pan_speed=5, zoom_speed=0.1):
@@ -41,6 +42,35 @@ class Camera:
         """Convert screen coordinates to world coordinates."""
         return (pygame.Vector2(screen_pos) + self.offset) / self.scale
 
+    def apply_many(self, world_points, margin=0):
+        """Convert a (..., 2) array of world points to screen coordinates in one operation.
+
+        Returns (screen_points, on_screen), where on_screen is a (...) mask of the
+        points inside the screen grown by margin pixels.
+        """
+        screen_points = np.asarray(world_points, dtype=np.float64) * self.scale - (self.offset.x, self.offset.y)
+        return screen_points, self.on_screen(screen_points, margin)
+
+    def to_world_many(self, screen_points, margin=0):
+        """Convert a (..., 2) array of screen points to world coordinates; returns (world_points, on_screen)."""
+        screen_points = np.asarray(screen_points, dtype=np.float64)
+        world_points = (screen_points + (self.offset.x, self.offset.y)) / self.scale
+        return world_points, self.on_screen(screen_points, margin)
+
+    def on_screen(self, screen_points, margin=0):
+        """Mask of the (..., 2) screen points inside the screen grown by margin pixels."""
+        sx, sy = screen_points[..., 0], screen_points[..., 1]
+        return (
+            (sx >= -margin) & (sx <= self.screen_size.x + margin)
+            & (sy >= -margin) & (sy <= self.screen_size.y + margin)
+        )
+
+    def visible_rect(self, margin=0):
+        """World-space (left, top, right, bottom) rectangle currently on screen, grown by margin world units."""
+        left, top = self.to_world((0, 0))
+        right, bottom = self.to_world(self.screen_size)
+        return (left - margin, top - margin, right + margin, bottom + margin)
+
     def zoom(self, zoom_factor, zoom_pos):
         pos = pygame.Vector2(zoom_pos)
         world_before = self.to_world(pos)
@@ -0,0 +1,122 @@
+"""Versioned binary checkpoints of colony state, loaded with `np.memmap`.
+
+Layout (all little-endian):
+
+    header   magic b"ANTCKPT\\0", version, field count, header size,
+             ant count, world width, world height, tick,
+             random stream key, next stream id
+    fields   one entry per array: name, dtype, ndim, trailing shape, byte offset
+    data     the raw arrays, each starting on a 64-byte boundary
+
+Loading maps every array straight from the file, so restoring a colony of
+millions of ants reads nothing up front; pages are pulled in (and privately
+copied on write) only as the simulation touches them.
+"""
+import struct
+import numpy as np # type: ignore
+from colony import AntColony, STATE_FIELDS
+from rng import AntStreams, streams as shared_streams
+
+MAGIC = b"ANTCKPT\0"
+VERSION = 1
+ALIGN = 64
+
+# magic, version, field count, header size, count, width, height, tick, stream key, next stream id
+_HEADER = struct.Struct("<8sIIQQddQQQ")
+_FIELD = struct.Struct("<24s8sB3x3IQ")  # name, dtype, ndim, trailing shape (padded to 3), offset
+
+class CheckpointError(ValueError):
+    pass
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGN) * ALIGN
+
+def save(path: str, colony, tick: int = 0, streams: AntStreams | None = None) -> None:
+    """Write every `STATE_FIELDS` array of `colony` (an `AntColony` or anything with the same attributes).
+
+    `streams` defaults to the colony's own random streams, else the shared ones.
+    """
+    streams = getattr(colony, "streams", shared_streams) if streams is None else streams
+    count = len(colony)
+    # Culled or suspended legs are left behind; store them in their rest pose
+    settled_legs = getattr(colony, "settled_legs", None)
+    legs = {} if settled_legs is None else settled_legs()
+    arrays = {}
+    for name, (shape, dtype) in STATE_FIELDS.items():
+        value = legs[name] if name in legs else getattr(colony, name)
+        array = np.ascontiguousarray(value, dtype=np.dtype(dtype).newbyteorder("<"))
+        if array.shape != (count,) + shape:
+            raise CheckpointError(f"{name} has shape {array.shape}, expected {(count,) + shape}")
+        arrays[name] = array
+
+    header_size = _HEADER.size + _FIELD.size * len(arrays)
+    entries, offset = [], _align(header_size)
+    for name, array in arrays.items():
+        trailing = array.shape[1:]
+        entries.append(_FIELD.pack(
+            name.encode(), array.dtype.str.encode(), len(trailing), *(trailing + (0,) * (3 - len(trailing))), offset
+        ))
+        offset = _align(offset + array.nbytes)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, VERSION, len(arrays), header_size, count, colony.WIDTH, colony.HEIGHT, tick,
+            int(streams.key), streams.next_id,
+        ))
+        for entry in entries:
+            f.write(entry)
+        for entry, array in zip(entries, arrays.values()):
+            f.seek(_FIELD.unpack(entry)[-1])
+            array.tofile(f)
+
+def read_header(path: str) -> tuple[dict, dict[str, tuple]]:
+    """Return (metadata, {field name: (dtype, trailing shape, offset)}) without touching the data."""
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise CheckpointError(f"{path}: truncated header")
+        magic, version, nfields, header_size, count, width, height, tick, key, next_id = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise CheckpointError(f"{path}: not a colony checkpoint")
+        if version != VERSION:
+            raise CheckpointError(f"{path}: unsupported checkpoint version {version}")
+
+        fields = {}
+        for _ in range(nfields):
+            name, dtype, ndim, s0, s1, s2, offset = _FIELD.unpack(f.read(_FIELD.size))
+            fields[name.rstrip(b"\0").decode()] = (np.dtype(dtype.rstrip(b"\0").decode()), (s0, s1, s2)[:ndim], offset)
+
+    meta = {
+        "version": version, "count": count, "WIDTH": width, "HEIGHT": height, "tick": tick,
+        "key": key, "next_id": next_id,
+    }
+    return meta, fields
+
+def load_state(path: str, mode: str = "c") -> tuple[dict, dict[str, np.ndarray]]:
+    """Memory-map every field of a checkpoint. The default copy-on-write mode never modifies the file."""
+    meta, fields = read_header(path)
+    missing = STATE_FIELDS.keys() - fields.keys()
+    if missing:
+        raise CheckpointError(f"{path}: missing fields {sorted(missing)}")
+
+    state = {}
+    for name, (dtype, trailing, offset) in fields.items():
+        shape = (meta["count"],) + tuple(trailing)
+        if meta["count"] == 0:
+            state[name] = np.empty(shape, dtype=dtype)
+        else:
+            state[name] = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+    return meta, state
+
+def load(path: str, **kwargs) -> tuple[AntColony, int, AntStreams]:
+    """Restore an `AntColony` backed by the mapped file; returns (colony, tick, streams). `kwargs` go to `AntColony`.
+
+    The colony draws from `streams`, rebuilt from the file, so it continues the saved run
+    exactly; pass them on (`streams=`, or `rng.streams.restore(...)`) to give new ants fresh ids.
+    """
+    meta, state = load_state(path)
+    kwargs.setdefault("WIDTH", int(meta["WIDTH"]))
+    kwargs.setdefault("HEIGHT", int(meta["HEIGHT"]))
+    kwargs.setdefault("streams", AntStreams.from_key(meta["key"], meta["next_id"]))
+    colony = AntColony.from_state(state, copy=False, **kwargs)
+    return colony, meta["tick"], colony.streams
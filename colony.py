@@ -0,0 +1,237 @@
+import numpy as np # type: ignore
+from ant import max_rotation_speed, eased_t, WIDTH, HEIGHT, BACKEND
+from gait import GaitEngine, hip_offsets, foot_offsets, max_distortions_sq, min_leg_length, max_leg_length
+from spatial import UniformGrid
+from pheromone import PheromoneField
+from to_be_optimized import left_right_many, turn_many
+from rng import AntStreams, streams as shared_streams
+
+if BACKEND == "cython":
+    from optimized import colony_step # type: ignore
+else:
+    colony_step = None
+
+# Per-ant state arrays: name -> (trailing shape, dtype)
+STATE_FIELDS = {
+    "x": ((), np.float64),
+    "y": ((), np.float64),
+    "speed": ((), np.float64),
+    "dir": ((), np.float64),
+    "rotation_speed": ((), np.float64),
+    "target": ((2,), np.float64),
+    "hip_positions": ((6, 2), np.float64),
+    "feet_positions": ((6, 2), np.float64),
+    "feet_frames": ((6,), np.int32),
+    "stream": ((), np.int64),
+    "draws": ((), np.int64),
+}
+
+class AntColony:
+    """Structure-of-arrays ant population, stepped in one vectorized call per tick."""
+    def __init__(
+        self,
+        count: int,
+        x: np.ndarray | None = None,
+        y: np.ndarray | None = None,
+        speed: np.ndarray | float | None = None,
+        dir: np.ndarray | None = None,
+        target: np.ndarray | None = None,
+        WIDTH: int = WIDTH,
+        HEIGHT: int = HEIGHT,
+        avoid_radius: int | float | None = None,
+        avoid_strength: int | float = 1.0,
+        pheromones: PheromoneField | None = None,
+        threads: int = 0,
+        stream: np.ndarray | None = None,
+        streams: AntStreams | None = None
+    ) -> None:
+        # Random stream ids; draw 0 spawns each ant, every later draw is a new target
+        streams = shared_streams if streams is None else streams
+        self.stream = streams.spawn(count) if stream is None else np.array(stream, dtype=np.int64)
+        self.draws = np.ones(count, dtype=np.int64)
+        spawn = streams.spawn_state(self.stream, WIDTH, HEIGHT).astype(np.float64)
+
+        self.x = spawn[:, 0].copy() if x is None else np.array(x, dtype=np.float64)
+        self.y = spawn[:, 1].copy() if y is None else np.array(y, dtype=np.float64)
+        self.speed = np.full(count, 0.5 if speed is None else speed, dtype=np.float64)
+        self.dir = spawn[:, 2].copy() if dir is None else np.array(dir, dtype=np.float64)
+        self.target = spawn[:, 3:].copy() if target is None else np.array(target, dtype=np.float64).reshape(count, 2)
+
+        self.rotation_speed = np.zeros(count, dtype=np.float64)
+
+        self.gait = GaitEngine(self.x, self.y, self.dir)
+
+        self._configure(WIDTH, HEIGHT, avoid_radius, avoid_strength, pheromones, threads, streams)
+
+    def _configure(
+        self,
+        WIDTH: int = WIDTH,
+        HEIGHT: int = HEIGHT,
+        avoid_radius: int | float | None = None,
+        avoid_strength: int | float = 1.0,
+        pheromones: PheromoneField | None = None,
+        threads: int = 0,
+        streams: AntStreams | None = None
+    ) -> None:
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
+
+        # Local avoidance is opt-in; the grid is only kept when it is used
+        self.avoid_radius = avoid_radius
+        self.avoid_strength = avoid_strength
+        self.grid = UniformGrid((WIDTH, HEIGHT), avoid_radius) if avoid_radius else None
+
+        # With a pheromone field, ants follow its gradient and only retarget randomly where there is none
+        self.pheromones = pheromones
+
+        # World rectangle (left, top, right, bottom) whose ants get their legs animated; None animates all
+        self.view = None
+
+        # Worker threads for the compiled kernel (0 = one per core); unused without the Cython backend
+        self.threads = threads
+
+        self.streams = shared_streams if streams is None else streams
+
+    @classmethod
+    def from_ants(cls, ants) -> "AntColony":
+        """Build a colony holding the same state as a list of `Ant` objects."""
+        colony = cls(
+            len(ants),
+            x=[a.x for a in ants],
+            y=[a.y for a in ants],
+            speed=np.array([a.speed for a in ants]),
+            dir=[a.dir for a in ants],
+            target=[a.target for a in ants],
+            stream=[a.stream for a in ants],
+        )
+        colony.draws[:] = [a.draws for a in ants]
+        colony.rotation_speed[:] = [a.rotation_speed for a in ants]
+        colony.hip_positions[:] = [a.hip_positions for a in ants]
+        colony.feet_positions[:] = [a.feet_positions for a in ants]
+        colony.feet_frames[:] = [a.feet_frames for a in ants]
+        return colony
+
+    @classmethod
+    def from_state(cls, state: dict[str, np.ndarray], copy: bool = True, **kwargs) -> "AntColony":
+        """Build a colony from `STATE_FIELDS` arrays; `kwargs` are the world options of `__init__`.
+
+        With `copy=False` the arrays are adopted as-is (they must already have the
+        `STATE_FIELDS` dtypes), e.g. to run straight off a memory-mapped checkpoint.
+        """
+        if copy:
+            state = {name: np.array(state[name], dtype=dtype) for name, (_, dtype) in STATE_FIELDS.items()}
+
+        colony = cls.__new__(cls)
+        colony.x = state["x"]
+        colony.y = state["y"]
+        colony.speed = state["speed"]
+        colony.dir = state["dir"]
+        colony.target = state["target"]
+        colony.rotation_speed = state["rotation_speed"]
+        colony.stream = state["stream"]
+        colony.draws = state["draws"]
+        colony.gait = GaitEngine.from_arrays(state["hip_positions"], state["feet_positions"], state["feet_frames"])
+        colony._configure(**kwargs)
+        return colony
+
+    def state(self) -> dict[str, np.ndarray]:
+        """The colony's `STATE_FIELDS` arrays (not copied)."""
+        return {name: getattr(self, name) for name in STATE_FIELDS}
+
+    def __len__(self) -> int:
+        return self.x.shape[0]
+
+    @property
+    def hip_positions(self) -> np.ndarray:
+        return self.gait.hip_positions
+
+    @property
+    def feet_positions(self) -> np.ndarray:
+        return self.gait.feet_positions
+
+    @property
+    def feet_frames(self) -> np.ndarray:
+        return self.gait.feet_frames
+
+    def settled_legs(self) -> dict[str, np.ndarray]:
+        """Leg `STATE_FIELDS` with the legs of un-animated ants at rest, as a recording or checkpoint should see them."""
+        hips, feet, frames = self.gait.settled(self.x, self.y, self.dir)
+        return {"hip_positions": hips, "feet_positions": feet, "feet_frames": frames}
+
+    def retarget(self) -> None:
+        delta = self.target - np.stack([self.x, self.y], axis=-1)
+        arrived = np.flatnonzero(np.einsum('ij,ij->i', delta, delta) < 4)
+        if arrived.size:
+            self.target[arrived] = self.streams.targets(self.stream[arrived], self.draws[arrived], self.WIDTH, self.HEIGHT)
+            self.draws[arrived] += 1
+
+    def avoidance(self) -> np.ndarray:
+        """Separation push from nearby ants, rebuilt from the grid each tick."""
+        self.grid.update(self.x, self.y)
+        return self.grid.separation(self.avoid_radius, self.avoid_strength)
+
+    def steer(self, avoid: np.ndarray | None = None, heading: np.ndarray | None = None) -> None:
+        """`left_right` + `turn` for every ant; `avoid` is an optional (N, 2) steering push.
+
+        `heading` is an optional (N, 2) point to steer at instead of `target`.
+        """
+        heading = self.target if heading is None else heading
+        left, right = left_right_many(self.x, self.y, heading, self.dir, avoid)
+        dir, rotation_speed = turn_many(self.dir, self.rotation_speed, left, right, max_rotation_speed)
+        # In place, so adopted state arrays keep seeing the update
+        self.dir[:] = dir
+        self.rotation_speed[:] = rotation_speed
+
+    def move(self) -> None:
+        rad = np.radians(self.dir)
+        self.x += self.speed * np.cos(rad)
+        self.y += self.speed * np.sin(rad)
+
+    def in_view(self) -> np.ndarray | None:
+        """Mask of the ants inside `view`, or None when there is no view."""
+        if self.view is None:
+            return None
+        left, top, right, bottom = self.view
+        x, y = self.x, self.y
+        return (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+
+    def update_feet(self) -> None:
+        visible = self.in_view()
+        self.gait.step(self.x, self.y, self.dir, None if visible is None else np.flatnonzero(visible))
+
+    def step_compiled(self, avoid: np.ndarray | None = None, heading: np.ndarray | None = None) -> None:
+        """`steer`, `move` and `update_feet` in one pass of the multi-threaded Cython kernel."""
+        gait = self.gait
+        # Culled by `view` inside the kernel, after the move, like `update_feet`
+        animate = np.full(len(self), not gait.suspended, dtype=np.uint8)
+
+        colony_step(
+            self.x, self.y, self.speed, self.dir, self.rotation_speed, self.target if heading is None else heading,
+            gait.hip_positions, gait.feet_positions, gait.feet_frames, animate, gait.stale.view(np.uint8),
+            hip_offsets, foot_offsets, max_distortions_sq, eased_t,
+            max_rotation_speed, min_leg_length, max_leg_length,
+            avoid=None if avoid is None else np.ascontiguousarray(avoid, dtype=np.float64),
+            view=None if self.view is None else tuple(map(float, self.view)),
+            num_threads=self.threads,
+        )
+
+    def animate_feet(self, enabled: bool) -> None:
+        """Suspend or resume foot animation; on resume every foot snaps back to a valid rest pose."""
+        self.gait.suspended = not enabled
+
+    def step(self) -> None:
+        """Advance every ant by one tick; mirrors `Ant.update`."""
+        self.retarget()
+        heading = None
+        if self.pheromones is not None:
+            heading = self.pheromones.steer_targets(self.x, self.y, self.dir, self.target)
+        avoid = self.avoidance() if self.grid is not None else None
+        if colony_step is not None:
+            self.step_compiled(avoid, heading)
+        else:
+            self.steer(avoid, heading)
+            self.move()
+            self.update_feet()
+        if self.pheromones is not None:
+            self.pheromones.deposit(self.x, self.y)
+            self.pheromones.step()
@@ -0,0 +1,82 @@
+"""Dirty-rectangle rendering: repaint and present only the screen regions ants moved through.
+
+While the camera holds still, each frame restores the background under every
+ant's previous and current screen bounds, redraws the ants and hands just those
+rectangles to `pygame.display.update`. Any camera change (or a population of a
+different size) falls back to a full redraw and `pygame.display.flip`.
+"""
+import numpy as np # type: ignore
+import pygame # type: ignore
+from render import draw_colony, lod_tier, body_sprites, ANT_REACH, LOD_PIXEL
+from layers import world_layers
+
+# Past this many rectangles one full update is cheaper than many small ones
+MAX_DIRTY_RECTS = 512
+
+class DirtyRectRenderer:
+    """Draws a colony onto `surface` (the display surface), tracking what changed since the last frame."""
+    def __init__(self, surface, world_size, border_margin, sprites=body_sprites) -> None:
+        self.surface = surface
+        self.world_size = world_size
+        self.border_margin = border_margin
+        self.sprites = sprites
+
+        self.layers = world_layers(surface.get_size(), world_size, border_margin)
+        self._camera = None
+        self._bounds = None
+        self._invalid = []
+
+    def invalidate(self, rect) -> None:
+        """Restore and present `rect` on the next frame, e.g. where an overlay was drawn on top."""
+        self._invalid.append(pygame.Rect(rect))
+
+    def _screen_bounds(self, colony, camera, tier) -> np.ndarray:
+        """(N, 4) left, top, right, bottom screen bounds of every ant; NaN for ants off screen."""
+        reach = 1 if tier == LOD_PIXEL else ANT_REACH * camera.scale + 2
+        points, on_screen = camera.apply_many(np.stack([colony.x, colony.y], axis=-1), margin=ANT_REACH * camera.scale)
+        bounds = np.concatenate([points - reach, points + reach], axis=-1)
+        bounds[~on_screen] = np.nan
+        return bounds
+
+    def draw(self, colony, camera, tier=None) -> list | None:
+        """Draw one frame; returns the changed rectangles, or None after a full redraw."""
+        tier = lod_tier(camera.scale) if tier is None else tier
+        state = (camera.offset.x, camera.offset.y, camera.scale, tier)
+        bounds = self._screen_bounds(colony, camera, tier)
+
+        full = state != self._camera or self._bounds is None or len(self._bounds) != len(bounds)
+        if not full:
+            old, new = self._bounds, bounds
+            # fmin/fmax skip the NaN side, so ants entering or leaving the view keep their one real box
+            union = np.concatenate([np.fmin(old[:, :2], new[:, :2]), np.fmax(old[:, 2:], new[:, 2:])], axis=-1)
+            union = union[(union[:, 2] > union[:, 0]) & (union[:, 3] > union[:, 1])]
+            full = len(union) + len(self._invalid) > MAX_DIRTY_RECTS
+
+        self._camera = state
+        self._bounds = bounds
+        invalid, self._invalid = self._invalid, []
+
+        if full:
+            self.layers.draw(self.surface, camera)
+            draw_colony(colony, self.surface, camera, self.sprites, tier)
+            return None
+
+        left, top = np.floor(union[:, :2]).astype(int).T
+        right, bottom = np.ceil(union[:, 2:]).astype(int).T
+        rects = [pygame.Rect(l, t, r - l, b - t) for l, t, r, b in zip(left.tolist(), top.tolist(), right.tolist(), bottom.tolist())]
+        rects += invalid
+
+        screen = self.surface.get_rect()
+        rects = [rect.clip(screen) for rect in rects]
+        rects = [rect for rect in rects if rect.width and rect.height]
+
+        self.layers.restore(self.surface, camera, rects)
+        draw_colony(colony, self.surface, camera, self.sprites, tier)
+        return rects
+
+    def present(self, rects: list | None, extra=()) -> None:
+        """Show a frame from `draw`: update just `rects` (plus `extra`), or flip after a full redraw."""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects + list(extra))
@@ -0,0 +1,144 @@
+"""Offline frame export: simulate and draw to an off-screen Surface, encoding numbered frames on a process pool.
+
+    python -m export --ants 2000 --ticks 3600 --out frames --format png
+    ffmpeg -framerate 60 -i frames/frame_%06d.png run.mp4
+
+`--format raw` writes headerless RGB24 frames (height x width x 3 bytes), e.g. for
+`ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -i frames/frame_%06d.rgb`. At most
+`--max-pending` frames are in flight; past that the simulation waits for the
+encoders, so memory stays bounded however long the run is.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np # type: ignore
+import pygame # type: ignore
+from ant import WIDTH, HEIGHT
+from colony import AntColony
+from camera import Camera
+from render import draw_colony, draw_ant, draw_border, cull_rect, lod_tier, LOD_FULL, BACKGROUND
+from sim import build, step
+from tiled import TiledSimulation
+import rng
+
+BORDER_MARGIN = 10
+FORMATS = {"png": "png", "raw": "rgb"}
+
+def _encode(pixels: np.ndarray, path: str, fmt: str) -> str:
+    """Write one (width, height, 3) frame; runs in a pool worker."""
+    if fmt == "png":
+        pygame.image.save(pygame.surfarray.make_surface(pixels), path)
+    else:
+        np.ascontiguousarray(pixels.transpose(1, 0, 2)).tofile(path)
+    return path
+
+class FrameExporter:
+    """Numbered frames encoded in parallel worker processes, with at most `max_pending` in flight."""
+    def __init__(self, out_dir: str, fmt: str = "png", workers: int | None = None, max_pending: int | None = None) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown frame format {fmt!r}; expected one of {sorted(FORMATS)}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.frames = 0
+
+        workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self.max_pending = max_pending or 2 * workers
+        self._pending = deque()
+
+    def submit(self, surface) -> str:
+        """Copy the pixels of `surface` and queue them for encoding; blocks while the queue is full."""
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()
+
+        path = os.path.join(self.out_dir, f"frame_{self.frames:06d}.{FORMATS[self.fmt]}")
+        self._pending.append(self._pool.submit(_encode, pygame.surfarray.array3d(surface), path, self.fmt))
+        self.frames += 1
+        return path
+
+    def close(self) -> None:
+        """Wait for every queued frame, then stop the workers."""
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self) -> "FrameExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def fit_camera(world_size, screen_size, border_margin: int = BORDER_MARGIN) -> Camera:
+    """A camera zoomed out to show the whole world and its border, centred on screen."""
+    camera = Camera(world_size=world_size, screen_size=screen_size, border_margin=border_margin)
+    camera.scale = camera.target_scale = camera.min_scale
+    camera.offset = (pygame.Vector2(world_size) * camera.scale - camera.screen_size) / 2
+    camera.target_offset = pygame.Vector2(camera.offset)
+    return camera
+
+def draw_frame(population, surface, camera, world_size, border_margin: int = BORDER_MARGIN) -> None:
+    surface.fill(BACKGROUND)
+    if isinstance(population, (AntColony, TiledSimulation)):
+        draw_colony(population, surface, camera)
+    else:
+        for ant in population:
+            draw_ant(ant, surface, camera)
+    draw_border(surface, camera, world_size, border_margin)
+
+def export(population, ticks: int, exporter: FrameExporter, camera: Camera, world_size, every: int = 1) -> float:
+    """Step `population` for `ticks` ticks, exporting every `every`-th; returns frames written per second."""
+    surface = pygame.Surface((int(camera.screen_size.x), int(camera.screen_size.y)))
+    if isinstance(population, AntColony):
+        # Same level of detail and leg culling as the live view
+        population.animate_feet(lod_tier(camera.scale) == LOD_FULL)
+        population.view = cull_rect(camera)
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        step(population)
+        if tick % every == 0:
+            draw_frame(population, surface, camera, world_size)
+            exporter.submit(surface)
+    elapsed = time.perf_counter() - start
+    return exporter.frames / elapsed if elapsed > 0 else float("inf")
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Render a simulation run to numbered image files without a window.")
+    parser.add_argument("--ants", type=int, default=1000, help="number of ants")
+    parser.add_argument("--ticks", type=int, default=600, help="number of ticks to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the per-ant random streams")
+    parser.add_argument("--width", type=int, default=WIDTH, help="world width")
+    parser.add_argument("--height", type=int, default=HEIGHT, help="world height")
+    parser.add_argument("--objects", action="store_true", help="step a list of Ant objects instead of an AntColony")
+    parser.add_argument("--tiles", type=int, nargs=2, metavar=("COLS", "ROWS"), default=None,
+                        help="split the world into COLS x ROWS tiles, one worker process each")
+    parser.add_argument("--out", default="frames", help="directory for the frames")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="png", help="frame file format")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("W", "H"), default=(1280, 720), help="frame size in pixels")
+    parser.add_argument("--every", type=int, default=1, help="export every Nth tick")
+    parser.add_argument("--workers", type=int, default=None, help="encoder processes (default: one per core)")
+    parser.add_argument("--max-pending", type=int, default=None, help="frames in flight before the simulation waits")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        rng.seed(args.seed)
+
+    world_size = (args.width, args.height)
+    camera = fit_camera(world_size, args.size)
+    population = build(args.ants, args.objects, args.width, args.height, args.tiles)
+    try:
+        with FrameExporter(args.out, args.format, args.workers, args.max_pending) as exporter:
+            fps = export(population, args.ticks, exporter, camera, world_size, args.every)
+    finally:
+        if isinstance(population, TiledSimulation):
+            population.close()
+
+    print(f"{exporter.frames} frames of {args.ants} ants to {args.out}/: {fps:.1f} frames/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Frame handoff from a pygame render thread to a GUI thread through a bounded ring of reused buffers.
+
+The producer copies a Surface's pixel buffer, in its native layout, into a
+free slot with one memcpy and publishes it. The consumer takes the newest
+published frame; any frame published before it was never shown and is
+dropped. With one slot being written, one published and one being read,
+three slots are enough that neither side ever blocks, and nothing is
+allocated per frame unless the surface size changes.
+
+Slots hold raw rows of `pitch` bytes; `rawmode` names their byte order for PIL:
+
+    frame, size, mode = ring.take()
+    image = Image.frombuffer("RGB", size, frame, "raw", mode, frame.shape[1], 1)
+"""
+import sys
+import threading
+import numpy as np # type: ignore
+
+def rawmode(surface) -> str:
+    """PIL raw mode ("BGRX", "RGB", ...) for decoding a 24/32-bit surface's bytes to RGB; alpha is skipped."""
+    bytesize = surface.get_bytesize()
+    if bytesize not in (3, 4):
+        raise ValueError(f"unsupported pixel size: {bytesize} bytes")
+    masks = surface.get_masks()
+    channels = []
+    for byte in range(bytesize):
+        shift = 8 * (byte if sys.byteorder == "little" else bytesize - 1 - byte)
+        name = next((c for c, mask in zip("RGB", masks) if mask == 0xFF << shift), "X")
+        channels.append(name)
+    return "".join(channels)
+
+class FrameRing:
+    """Triple-buffered raw frames from one producer thread to one consumer."""
+    def __init__(self, capacity: int = 3) -> None:
+        if capacity < 3:
+            raise ValueError("a frame ring needs at least 3 slots")
+        self.capacity = capacity
+        self.size = None
+        self.pitch = 0
+        self.rawmode = None
+        self.dropped = 0
+
+        self._slots = []
+        self._free = []
+        self._ready = None
+        self._reading = None
+        self._lock = threading.Lock()
+
+    def _allocate(self, surface) -> None:
+        self.size = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.rawmode = rawmode(surface)
+        self._slots = [np.empty((self.size[1], self.pitch), dtype=np.uint8) for _ in range(self.capacity)]
+        self._free = list(range(self.capacity))
+        self._ready = None
+        self._reading = None
+
+    def write(self, surface) -> None:
+        """Copy the pixels of `surface` into a free slot and publish it as the newest frame."""
+        with self._lock:
+            if surface.get_size() != self.size or surface.get_pitch() != self.pitch:
+                self._allocate(surface)
+            index = self._free.pop()
+            slot = self._slots[index]
+
+        buffer = surface.get_buffer()
+        np.copyto(slot, np.frombuffer(buffer, dtype=np.uint8).reshape(slot.shape))
+        del buffer  # unlock the surface
+
+        with self._lock:
+            if self._ready is not None:
+                self._free.append(self._ready)
+                self.dropped += 1
+            self._ready = index
+
+    def take(self) -> tuple[np.ndarray, tuple[int, int], str] | None:
+        """(frame, size, rawmode) of the newest frame not yet taken, or None. The previous one is recycled."""
+        with self._lock:
+            if self._ready is None:
+                return None
+            if self._reading is not None:
+                self._free.append(self._reading)
+            self._reading, self._ready = self._ready, None
+            return self._slots[self._reading], self.size, self.rawmode
@@ -0,0 +1,124 @@
+import numpy as np # type: ignore
+from ant import (
+    x_offsets0, y_offsets0, x_offsets, y_offsets, max_distortions,
+    interpolation_frames, eased_t
+)
+
+max_leg_length = 16
+min_leg_length = 3
+
+# Per-leg offsets relative to the ant centre, before rotation (leg i uses row i % 3)
+hip_offsets = np.stack([x_offsets0, y_offsets0[np.arange(6) % 3]], axis=-1)
+foot_offsets = hip_offsets + np.stack([x_offsets, -y_offsets[np.arange(6) % 3]], axis=-1)
+
+max_distortions_sq = max_distortions[np.arange(6) % 3].astype(np.float64)**2
+
+def place_legs(
+        x: np.ndarray,
+        y: np.ndarray,
+        dir: np.ndarray,
+        offsets: np.ndarray
+    ) -> np.ndarray:
+    """Rotate (6, 2) leg offsets by dir+90 around each ant, returning shape (N, 6, 2)."""
+    rad = np.radians(np.asarray(dir) + 90)[:, None]
+    c, s = np.cos(rad), np.sin(rad)
+    px = np.asarray(x)[:, None] + offsets[:, 0] * c - offsets[:, 1] * s
+    py = np.asarray(y)[:, None] + offsets[:, 0] * s + offsets[:, 1] * c
+    return np.stack([px, py], axis=-1)
+
+class GaitEngine:
+    """Hip/foot positions and step frames for every leg of every ant, as (N, 6, 2) / (N, 6) arrays.
+
+    Legs are only animated for the ants passed to `step`. The others are marked
+    stale and snap to their rest pose the next time they are stepped, since
+    foot positions only matter for drawing.
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, dir: np.ndarray) -> None:
+        self.hip_positions = place_legs(x, y, dir, hip_offsets)
+        self.feet_positions = place_legs(x, y, dir, foot_offsets)
+        self.feet_frames = np.zeros(self.hip_positions.shape[:2], dtype=np.int32)
+        self.stale = np.zeros(len(self.feet_frames), dtype=bool)
+        self.suspended = False
+
+    @classmethod
+    def from_arrays(cls, hip_positions: np.ndarray, feet_positions: np.ndarray, feet_frames: np.ndarray) -> "GaitEngine":
+        """Wrap existing (N, 6, 2) / (N, 6) arrays without copying them."""
+        gait = cls.__new__(cls)
+        gait.hip_positions = hip_positions
+        gait.feet_positions = feet_positions
+        gait.feet_frames = feet_frames
+        gait.stale = np.zeros(len(feet_frames), dtype=bool)
+        gait.suspended = False
+        return gait
+
+    def rest(self, x: np.ndarray, y: np.ndarray, dir: np.ndarray, index=slice(None)) -> None:
+        """Snap the legs of ants `index` to their rest pose, with no step in progress."""
+        x, y, dir = x[index], y[index], dir[index]
+        self.hip_positions[index] = place_legs(x, y, dir, hip_offsets)
+        self.feet_positions[index] = place_legs(x, y, dir, foot_offsets)
+        self.feet_frames[index] = 0
+        self.stale[index] = False
+
+    def settled(self, x: np.ndarray, y: np.ndarray, dir: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(hips, feet, frames) with stale ants in their rest pose, for readers that bypass `step`.
+
+        The engine itself is left untouched; the arrays are only copied if some ant is stale.
+        """
+        if not self.stale.any():
+            return self.hip_positions, self.feet_positions, self.feet_frames
+        stale = np.flatnonzero(self.stale)
+        hips, feet, frames = self.hip_positions.copy(), self.feet_positions.copy(), self.feet_frames.copy()
+        x, y, dir = x[stale], y[stale], dir[stale]
+        hips[stale] = place_legs(x, y, dir, hip_offsets)
+        feet[stale] = place_legs(x, y, dir, foot_offsets)
+        frames[stale] = 0
+        return hips, feet, frames
+
+    def step(self, x: np.ndarray, y: np.ndarray, dir: np.ndarray, active: np.ndarray | None = None) -> None:
+        """Batched `Ant.update_feet` for the ants at indices `active` (all of them by default)."""
+        if self.suspended:
+            self.stale[:] = True
+            return
+
+        if active is None:
+            if self.stale.any():
+                self.rest(x, y, dir, np.flatnonzero(self.stale))
+            self.hip_positions[...] = _advance(x, y, dir, self.feet_positions, self.feet_frames)
+            return
+
+        woke = active[self.stale[active]]
+        if woke.size:
+            self.rest(x, y, dir, woke)
+        self.stale[:] = True
+        self.stale[active] = False
+
+        feet, frames = self.feet_positions[active], self.feet_frames[active]
+        self.hip_positions[active] = _advance(x[active], y[active], dir[active], feet, frames)
+        self.feet_positions[active] = feet
+        self.feet_frames[active] = frames
+
+def _advance(x: np.ndarray, y: np.ndarray, dir: np.ndarray, feet: np.ndarray, frames: np.ndarray) -> np.ndarray:
+    """Threshold checks and eased steps for all legs at once; updates `feet`/`frames` in place and returns the hips."""
+    hips = place_legs(x, y, dir, hip_offsets)
+    ideal = place_legs(x, y, dir, foot_offsets)
+
+    d1 = feet - ideal
+    d2 = feet - hips
+    sq1 = np.einsum('ijk,ijk->ij', d1, d1)
+    sq2 = np.einsum('ijk,ijk->ij', d2, d2)
+
+    stepping = frames > 0
+    lift = ~stepping & (
+        (max_distortions_sq < sq1) | (sq2 < min_leg_length**2) | (max_leg_length**2 < sq2)
+    )
+
+    # Legs at rest get t = 0 and stay put
+    t = np.where(stepping, eased_t[np.maximum(frames - 1, 0)], 0.0)
+    feet -= d1 * t[..., None]
+    frames += stepping
+
+    done = frames > interpolation_frames
+    feet[done] = ideal[done]
+    frames[done] = 0
+    frames[lift] = 1
+    return hips
@@ -0,0 +1,92 @@
+"""Static layers (background, world border, terrain, ...) rendered once into a cached surface.
+
+The layers only depend on the camera, so they are redrawn only when the camera
+pans further than the cache's padding, or zooms enough to move some point within
+`extent` world units of the origin by more than `max_drift` pixels, or a layer's
+`key` changes. Smaller pans just shift where the cache is blitted, so a stable
+(or slowly panning) camera composites every static layer with a single blit.
+"""
+import copy
+import pygame # type: ignore
+from render import draw_border, BACKGROUND
+
+class StaticLayers:
+    """Layers drawn in order by `draw(surface, camera)` callables, cached for the current camera transform."""
+    def __init__(self, screen_size, extent: float, pad: int = 64, max_drift: float = 0.5) -> None:
+        self.extent = extent
+        self.pad = pad
+        self.max_drift = max_drift
+        self.layers = []
+        self.renders = 0
+
+        width, height = int(screen_size[0]), int(screen_size[1])
+        self.surface = pygame.Surface((width + 2 * pad, height + 2 * pad))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self._offset = None
+        self._scale = None
+        self._keys = None
+
+    def add(self, name: str, draw, key=None) -> None:
+        """Add a layer; `key(camera)`, if given, forces a redraw whenever its value changes."""
+        self.layers.append((name, draw, key))
+        self.invalidate()
+
+    def _key(self, camera) -> tuple:
+        return tuple(key(camera) for _, _, key in self.layers if key is not None)
+
+    def invalidate(self) -> None:
+        """Force a redraw on next use, e.g. after a layer's content changed."""
+        self._scale = None
+
+    def update(self, camera) -> bool:
+        """Redraw the cache if the camera moved past the thresholds; returns whether it did."""
+        keys = self._key(camera)
+        if self._scale is not None:
+            shift = self._offset - camera.offset
+            if (
+                abs(shift.x) <= self.pad and abs(shift.y) <= self.pad
+                and abs(camera.scale - self._scale) * self.extent <= self.max_drift
+                and keys == self._keys
+            ):
+                return False
+
+        # Same transform as the camera, moved so the cache covers `pad` extra pixels on every side
+        view = copy.copy(camera)
+        view.offset = camera.offset - pygame.Vector2(self.pad, self.pad)
+        for _, draw, _ in self.layers:
+            draw(self.surface, view)
+
+        self._offset = pygame.Vector2(camera.offset)
+        self._scale = camera.scale
+        self._keys = keys
+        self.renders += 1
+        return True
+
+    def origin(self, camera) -> tuple[int, int]:
+        """Screen position to blit the cache at for the current camera."""
+        shift = self._offset - camera.offset
+        return round(shift.x) - self.pad, round(shift.y) - self.pad
+
+    def draw(self, surface, camera) -> None:
+        """Composite all layers onto `surface` with one blit."""
+        self.update(camera)
+        surface.blit(self.surface, self.origin(camera))
+
+    def restore(self, surface, camera, rects) -> None:
+        """Repaint only `rects` of `surface` from the cache."""
+        self.update(camera)
+        ox, oy = self.origin(camera)
+        surface.blits([(self.surface, rect, rect.move(-ox, -oy)) for rect in rects], doreturn=False)
+
+def world_layers(screen_size, world_size, border_margin, **kwargs) -> StaticLayers:
+    """The background fill and the world border."""
+    layers = StaticLayers(screen_size, max(world_size) + border_margin, **kwargs)
+    layers.add("background", lambda surface, camera: surface.fill(BACKGROUND))
+    layers.add(
+        "border",
+        lambda surface, camera: draw_border(surface, camera, world_size, border_margin),
+        # The border's thickness snaps to whole world units as the scale changes
+        key=lambda camera: max(1, int(camera.scale * border_margin)),
+    )
+    return layers
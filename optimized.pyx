@@ -1,21 +1,19 @@
 cimport cython
 cimport numpy as np
 import numpy as np
-import pygame
-import pygame.gfxdraw
-cimport pygame
-from cython cimport double, bint
-from libc.math cimport sin, cos, atan2, pi
-from array import array
-from pygame.math import Vector2
+from libc.math cimport sin, cos, atan2, pi, hypot, fmod
+from cython.parallel cimport prange
+cimport openmp
+from rng import streams
 
-cdef np.ndarray x_offsets0 = np.array([-1.75, -2.0, -1.0, 1.75, 2.0, 1.0], dtype=np.float64)
-cdef np.ndarray y_offsets0 = np.array([4.0, 6.0, 7.0], dtype=np.float64)
+# Must match ant.py; `python -m bench --parity` checks both backends step identically
+cdef np.ndarray x_offsets0 = np.array([-5, -7.5, -4.5, 5, 7.5, 4.5], dtype=np.float64)
+cdef np.ndarray y_offsets0 = np.array([4, 10, 16], dtype=np.float64)
 
-cdef np.ndarray x_offsets = np.array([-5.5, -6.5, -7.0, 5.5, 6.5, 7.0], dtype=np.float64)
-cdef np.ndarray y_offsets = np.array([10.0, 0.5, -10.0], dtype=np.float64)
+cdef np.ndarray x_offsets = np.array([-5.5, -11, -7, 5.5, 11, 7], dtype=np.float64)
+cdef np.ndarray y_offsets = np.array([15, 1.5, -10.5], dtype=np.float64)
 
-cdef np.ndarray max_distortions = np.array([5.0, 5.0, 4.0], dtype=np.float64)
+cdef np.ndarray max_distortions = np.array([6, 7, 4], dtype=np.float64)
 
 # Optional: assign memoryviews for better performance inside loops
 #cdef double[:] x_offsets0 = _x_offsets0
@@ -28,7 +26,6 @@ cdef int interpolation_frames = 20
 cdef double max_rotation_speed = 4.0
 
 cdef np.ndarray eased_t = 3 * np.linspace(0, 1, interpolation_frames)**2 - 2 * np.linspace(0, 1, interpolation_frames)**3
-
 def draw_rotated_ellipse(int cx, int cy, int width, int height, tuple color, float angle, int ss_factor=2):
     """
     Draw an anti-aliased ellipse with supersampling (smooth scaling).
@@ -46,6 +43,10 @@ def draw_rotated_ellipse(int cx, int cy, int width, int height, tuple color, flo
       A tuple (final_surface, final_rect) where final_surface is a pygame.Surface
       containing the rotated ellipse and final_rect is its rect centered at (cx, cy).
     """
+    # Only drawing needs pygame; the simulation kernels below stay importable without it
+    import pygame
+    import pygame.gfxdraw
+
     cdef int high_width = width * ss_factor
     cdef int high_height = height * ss_factor
 
@@ -77,7 +78,8 @@ def draw_rotated_ellipse(int cx, int cy, int width, int height, tuple color, flo
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef inline double deg_to_rad(double angle):
-    return angle * 3.141592653589793 / 180.0
+    # Same rounding as math.radians
+    return angle * (pi / 180.0)
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -86,13 +88,11 @@ cpdef rotate_point(double px, double py, double ox, double oy, double angle):
     cdef double s = sin(rad)
     cdef double c = cos(rad)
 
-    px -= ox
-    py -= oy
-
-    cdef double xnew = px * c - py * s
-    cdef double ynew = px * s + py * c
+    cdef double dx = px - ox
+    cdef double dy = py - oy
 
-    return [xnew + ox, ynew + oy]
+    # Same operation order as to_be_optimized.rotate_point, so both round identically
+    return (ox + dx * c - dy * s, oy + dx * s + dy * c)
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -194,7 +194,7 @@ cpdef compute_ant_geometry(
 @cython.wraparound(False)
 cpdef left_right(
     double x, double y, 
-    tuple target, double dir
+    object target, double dir
 ):
     cdef double tx = float(target[0])
     cdef double ty = float(target[1])
@@ -212,9 +212,9 @@ cpdef left_right(
     cdef bint left = False
     cdef bint right = False
 
-    if abs(cross) < 5:
-        pass
-    elif cross > 0:
+    # No dead zone, as in to_be_optimized.left_right: ignoring targets a few
+    # units off the heading makes ants overshoot them
+    if cross > 0:
         right = True
     elif cross < 0:
         left = True
@@ -252,8 +252,10 @@ cpdef anti_aliase_line_coords(
 
     cdef np.ndarray[double, ndim=2] delta
     cdef np.ndarray[double, ndim=1] length, angle, cos_a, sin_a, dx_l, dy_l, dx_t, dy_t
-    cdef np.ndarray[double, ndim=2] center, UL, UR, BR, BL, rectangles
-    cdef double half_len, half_thick
+    cdef np.ndarray[double, ndim=2] center, UL, UR, BR, BL
+    cdef np.ndarray[double, ndim=3] rectangles
+    cdef np.ndarray[double, ndim=1] half_len
+    cdef double half_thick
 
     # Perform element-wise subtraction (which works with numpy arrays)
     delta = points1 - points2  # delta should be of shape (N, 2)
@@ -303,7 +305,7 @@ cpdef update_feet(
     # Use local variables to reduce attribute lookups
     cdef int i
     cdef double x0, y0, ideal_x1, ideal_y1, sq1, sq2
-    cdef np.ndarray apos, aideal, positions
+    cdef np.ndarray apos, aideal
     cdef tuple pos, ideal
     cdef double max_leg_length = 16.0
     cdef double min_leg_length = 3.0
@@ -319,17 +321,18 @@ cpdef update_feet(
 
         ideal = rotate_point(ideal_x1, ideal_y1, ant.x, ant.y, ant.dir + 90)
         x0, y0 = rotate_point(x0, y0, ant.x, ant.y, ant.dir + 90)
+        ant.hip_positions[i] = (x0, y0)
 
-        pos = ant.feet_positions[i]
+        pos = tuple(ant.feet_positions[i])
         apos = np.array(pos, dtype=np.float64)
         aideal = np.array(ideal, dtype=np.float64)
 
-        sq1 = np.sum((apos - aideal)**2)
-        sq2 = np.sum((apos - np.array([x0, y0]))**2)
+        sq1 = (apos[0] - aideal[0])**2 + (apos[1] - aideal[1])**2
+        sq2 = (apos[0] - x0)**2 + (apos[1] - y0)**2
 
         if ant.feet_frames[i] > 0:
-            positions = apos + (aideal - apos) * eased_t[:, None]
-            pos = positions[ant.feet_frames[i] - 1]
+            # Only the current row of the eased interpolation is needed
+            pos = tuple(apos + (aideal - apos) * eased_t[ant.feet_frames[i] - 1])
             ant.feet_frames[i] += 1
 
             if ant.feet_frames[i] > interpolation_frames:
@@ -343,24 +346,30 @@ cpdef update_feet(
 cdef class Ant:
     cdef public double x, y, speed, dir, rotation_speed
     cdef public int WIDTH, HEIGHT
+    cdef public long long stream, draws
     cdef public object target
     cdef public list feet_positions
     cdef public list feet_frames
+    cdef public list hip_positions
 
-    def __init__(self, int WIDTH=750, int HEIGHT=500, x=None, y=None, speed=None, dir=None, target=None):
-        import random
+    def __init__(self, x=None, y=None, speed=None, dir=None, target=None, int WIDTH=750, int HEIGHT=500, stream=None):
+        # Same random stream draws as ant.Ant
         self.WIDTH = WIDTH
         self.HEIGHT = HEIGHT
+        self.stream = streams.spawn(1)[0] if stream is None else stream
+        self.draws = 1
+        spawn_x, spawn_y, spawn_dir, target_x, target_y = streams.spawn_state(self.stream, WIDTH, HEIGHT)[0].tolist()
 
-        self.x = random.randint(0, WIDTH) if x is None else x
-        self.y = random.randint(0, HEIGHT) if y is None else y
+        self.x = spawn_x if x is None else x
+        self.y = spawn_y if y is None else y
         self.speed = 0.5 if speed is None else speed
-        self.dir = random.randint(0, 360) if dir is None else dir
+        self.dir = spawn_dir if dir is None else dir
         self.rotation_speed = 0.0
-        self.target = (random.randint(0, WIDTH), random.randint(0, HEIGHT)) if target is None else target
+        self.target = (target_x, target_y) if target is None else target
 
         self.feet_positions = []
         self.feet_frames = []
+        self.hip_positions = []
 
         cdef double x0, y0, x1, y1
         cdef int i
@@ -373,14 +382,16 @@ cdef class Ant:
             y1 = y0 - y_offsets[i % 3]
 
             x1, y1 = rotate_point(x1, y1, self.x, self.y, self.dir + 90)
+            x0, y0 = rotate_point(x0, y0, self.x, self.y, self.dir + 90)
 
             self.feet_positions.append((x1, y1))
             self.feet_frames.append(0)
+            self.hip_positions.append((x0, y0))
 
     cpdef update_feet(self):
         cdef int i
         cdef double x0, y0, ideal_x1, ideal_y1, sq1, sq2
-        cdef np.ndarray apos, aideal, positions
+        cdef np.ndarray apos, aideal
         cdef tuple pos, ideal
         cdef double max_leg_length = 16.0
         cdef double min_leg_length = 3.0
@@ -396,17 +407,18 @@ cdef class Ant:
 
             ideal = rotate_point(ideal_x1, ideal_y1, self.x, self.y, self.dir + 90)
             x0, y0 = rotate_point(x0, y0, self.x, self.y, self.dir + 90)
+            self.hip_positions[i] = (x0, y0)
 
-            pos = self.feet_positions[i]
+            pos = tuple(self.feet_positions[i])
             apos = np.array(pos, dtype=np.float64)
             aideal = np.array(ideal, dtype=np.float64)
 
-            sq1 = np.sum((apos - aideal)**2)
-            sq2 = np.sum((apos - np.array([x0, y0]))**2)
+            sq1 = (apos[0] - aideal[0])**2 + (apos[1] - aideal[1])**2
+            sq2 = (apos[0] - x0)**2 + (apos[1] - y0)**2
 
             if self.feet_frames[i] > 0:
-                positions = apos + (aideal - apos) * eased_t[:, None]
-                pos = positions[self.feet_frames[i] - 1]
+                # Only the current row of the eased interpolation is needed
+                pos = tuple(apos + (aideal - apos) * eased_t[self.feet_frames[i] - 1])
                 self.feet_frames[i] += 1
 
                 if self.feet_frames[i] > interpolation_frames:
@@ -419,10 +431,12 @@ cdef class Ant:
 
     cpdef update(self):
         cdef double rad
+        cdef double dx = self.target[0] - self.x
+        cdef double dy = self.target[1] - self.y
 
-        if np.dot(np.array(self.target) - np.array([self.x, self.y]), np.array(self.target) - np.array([self.x, self.y])) < 4.0:
-            import random
-            self.target = (random.randint(0, self.WIDTH), random.randint(0, self.HEIGHT))
+        if dx * dx + dy * dy < 4.0:
+            self.target = tuple(streams.targets(self.stream, self.draws, self.WIDTH, self.HEIGHT)[0].tolist())
+            self.draws += 1
 
         cdef bint left, right
         left, right = left_right(self.x, self.y, self.target, self.dir)
@@ -432,4 +446,142 @@ cdef class Ant:
         self.x += self.speed * cos(rad)
         self.y += self.speed * sin(rad)
 
-        self.update_feet()
\ No newline at end of file
+        self.update_feet()
+
+
+# Structure-of-arrays colony kernel: one call steers, moves and animates the legs
+# of every ant in parallel, without touching Python objects. Retargeting draws
+# random numbers and stays in Python; the arrays are those of colony.AntColony.
+
+cdef inline void _place(double x, double y, double c, double s, double ox, double oy, double* px, double* py) noexcept nogil:
+    px[0] = x + ox * c - oy * s
+    py[0] = y + ox * s + oy * c
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _step_ant(
+    Py_ssize_t i,
+    double[::1] x, double[::1] y, double[::1] speed, double[::1] dir, double[::1] rotation_speed,
+    double[:, ::1] target, double[:, ::1] avoid, bint use_avoid,
+    double[:, :, ::1] hips, double[:, :, ::1] feet, int[:, ::1] frames,
+    unsigned char[::1] animate, unsigned char[::1] stale,
+    bint use_view, double left, double top, double right, double bottom,
+    double[:, ::1] hip_offsets, double[:, ::1] foot_offsets, double[::1] max_distortions_sq,
+    double[::1] eased_t, double max_rotation_speed, double min_leg_length, double max_leg_length
+) noexcept nogil:
+    cdef double rad, c, s, dx, dy, cross, rs, d
+    cdef double hx, hy, ix, iy, d1x, d1y, d2x, d2y, sq1, sq2, t
+    cdef Py_ssize_t j
+    cdef bint stepping, lift
+    cdef int interpolation_frames = eased_t.shape[0]
+
+    # Steering: `left_right` + `turn`
+    rad = dir[i] * (pi / 180.0)
+    c = cos(rad)
+    s = sin(rad)
+    dx = target[i, 0] - x[i]
+    dy = target[i, 1] - y[i]
+    cross = c * dy - s * dx
+    if use_avoid:
+        d = hypot(dx, dy)
+        cross = cross / (d if d > 1e-9 else 1e-9) + (c * avoid[i, 1] - s * avoid[i, 0])
+
+    rs = rotation_speed[i]
+    if cross < 0:
+        rs = rs - 0.75 if rs - 0.75 > -max_rotation_speed else -max_rotation_speed
+    elif cross > 0:
+        rs = rs + 0.75 if rs + 0.75 < max_rotation_speed else max_rotation_speed
+    elif rs > 0:
+        rs = rs - 0.75 if rs > 0.75 else 0.0
+    elif rs < 0:
+        rs = rs + 0.75 if rs < -0.75 else 0.0
+    rotation_speed[i] = rs
+
+    d = fmod(dir[i] + rs, 360.0)
+    if d < 0:
+        d += 360.0
+    dir[i] = d
+
+    # Motion
+    rad = d * (pi / 180.0)
+    x[i] += speed[i] * cos(rad)
+    y[i] += speed[i] * sin(rad)
+
+    # Legs: `GaitEngine.step`, including the snap to rest for stale ants; culled where the ant ends up
+    if not animate[i] or (use_view and not (left <= x[i] <= right and top <= y[i] <= bottom)):
+        stale[i] = 1
+        return
+
+    rad = (d + 90) * (pi / 180.0)
+    c = cos(rad)
+    s = sin(rad)
+    for j in range(6):
+        _place(x[i], y[i], c, s, hip_offsets[j, 0], hip_offsets[j, 1], &hx, &hy)
+        _place(x[i], y[i], c, s, foot_offsets[j, 0], foot_offsets[j, 1], &ix, &iy)
+        hips[i, j, 0] = hx
+        hips[i, j, 1] = hy
+        if stale[i]:
+            feet[i, j, 0] = ix
+            feet[i, j, 1] = iy
+            frames[i, j] = 0
+
+        d1x = feet[i, j, 0] - ix
+        d1y = feet[i, j, 1] - iy
+        d2x = feet[i, j, 0] - hx
+        d2y = feet[i, j, 1] - hy
+        sq1 = d1x * d1x + d1y * d1y
+        sq2 = d2x * d2x + d2y * d2y
+
+        stepping = frames[i, j] > 0
+        lift = not stepping and (
+            max_distortions_sq[j] < sq1 or sq2 < min_leg_length * min_leg_length or max_leg_length * max_leg_length < sq2
+        )
+        if stepping:
+            t = eased_t[frames[i, j] - 1]
+            feet[i, j, 0] -= d1x * t
+            feet[i, j, 1] -= d1y * t
+            frames[i, j] += 1
+            if frames[i, j] > interpolation_frames:
+                feet[i, j, 0] = ix
+                feet[i, j, 1] = iy
+                frames[i, j] = 0
+        elif lift:
+            frames[i, j] = 1
+    stale[i] = 0
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def colony_step(
+    double[::1] x, double[::1] y, double[::1] speed, double[::1] dir, double[::1] rotation_speed,
+    double[:, ::1] target,
+    double[:, :, ::1] hips, double[:, :, ::1] feet, int[:, ::1] frames,
+    unsigned char[::1] animate, unsigned char[::1] stale,
+    double[:, ::1] hip_offsets, double[:, ::1] foot_offsets, double[::1] max_distortions_sq,
+    double[::1] eased_t, double max_rotation_speed, double min_leg_length, double max_leg_length,
+    double[:, ::1] avoid=None, tuple view=None, int num_threads=0
+):
+    """Steer, move and animate the legs of all ants in place, split across OpenMP threads.
+
+    `animate` selects the ants whose legs are stepped, further limited to those
+    that end the move inside `view` (left, top, right, bottom) when given; the
+    others are flagged in `stale` and snap to their rest pose the next time they
+    are animated. `num_threads=0` lets OpenMP decide.
+    """
+    cdef Py_ssize_t i, n = x.shape[0]
+    cdef bint use_avoid = avoid is not None
+    cdef bint use_view = view is not None
+    cdef double left = 0, top = 0, right = 0, bottom = 0
+    if use_view:
+        left, top, right, bottom = view
+    if not use_avoid:
+        avoid = target  # never read; a typed memoryview can't be None inside the loop
+    if num_threads <= 0:
+        num_threads = openmp.omp_get_max_threads()
+
+    for i in prange(n, nogil=True, schedule="static", num_threads=num_threads):
+        _step_ant(
+            i, x, y, speed, dir, rotation_speed, target, avoid, use_avoid, hips, feet, frames, animate, stale,
+            use_view, left, top, right, bottom,
+            hip_offsets, foot_offsets, max_distortions_sq, eased_t, max_rotation_speed, min_leg_length, max_leg_length
+        )
@@ -0,0 +1,89 @@
+"""Opt-in per-phase frame timing for the main loop, with an on-screen overlay and CSV export.
+
+    profiler = FrameProfiler(PHASES, csv_path="frames.csv")
+    with profiler.phase("update"):
+        colony.step()
+    ...
+    profiler.end_frame()
+"""
+import csv
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np # type: ignore
+import pygame # type: ignore
+
+PHASES = ("events", "update", "draw", "border", "flip", "camera")
+
+class FrameProfiler:
+    """Times named phases of every frame; keeps the last `window` frames for rolling statistics."""
+    def __init__(self, phases=PHASES, window: int = 240, csv_path: str | None = None) -> None:
+        self.phases = tuple(phases)
+        self.window = window
+        self.history = {name: deque(maxlen=window) for name in self.phases + ("total",)}
+        self.frame = 0
+        self._current = dict.fromkeys(self.phases, 0.0)
+
+        self._file = None
+        self._writer = None
+        if csv_path is not None:
+            self._file = open(csv_path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(("frame",) + self.phases + ("total",))
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] += time.perf_counter() - start
+
+    def end_frame(self) -> None:
+        """Close the current frame: store its phase times (in ms) and stream them to the CSV file."""
+        row = [self._current[name] * 1000 for name in self.phases]
+        row.append(sum(row))
+        for name, ms in zip(self.history, row):
+            self.history[name].append(ms)
+        if self._writer is not None:
+            self._writer.writerow([self.frame] + [f"{ms:.4f}" for ms in row])
+
+        self.frame += 1
+        self._current = dict.fromkeys(self.phases, 0.0)
+
+    def stats(self) -> dict[str, tuple[float, float, float]]:
+        """{phase: (mean, p95, p99)} in milliseconds over the rolling window."""
+        out = {}
+        for name, samples in self.history.items():
+            if samples:
+                values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+                p95, p99 = np.percentile(values, (95, 99))
+                out[name] = (values.mean(), p95, p99)
+        return out
+
+    def draw(self, surface, font, pos=(8, 8), color=(255, 255, 255), background=(0, 0, 0, 160)) -> pygame.Rect:
+        """Blit a mean/p95/p99 table of the rolling window onto `surface`; returns the area covered."""
+        lines = [f"{'phase':<8}{'mean':>8}{'p95':>8}{'p99':>8}  ms"]
+        for name, (mean, p95, p99) in self.stats().items():
+            lines.append(f"{name:<8}{mean:8.2f}{p95:8.2f}{p99:8.2f}")
+
+        rendered = [font.render(line, True, color) for line in lines]
+        height = font.get_linesize()
+        panel = pygame.Surface(
+            (max(text.get_width() for text in rendered) + 8, height * len(rendered) + 8), pygame.SRCALPHA
+        )
+        panel.fill(background)
+        panel.blits([(text, (4, 4 + i * height)) for i, text in enumerate(rendered)], doreturn=False)
+        return surface.blit(panel, pos)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def __enter__(self) -> "FrameProfiler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
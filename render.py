@@ -0,0 +1,129 @@
+import pygame # type: ignore
+import pygame.gfxdraw  # type: ignore
+import numpy as np # type: ignore
+from to_be_optimized import anti_aliase_line_coords
+from sprites import BodySpriteCache, FIRE_ANT_RED, DARK_RED, BLACK
+
+BACKGROUND = (200, 200, 200)
+
+# How far (in world units) legs and antennae reach out from an ant's centre;
+# used to pad the culling rectangle so partially visible ants are still drawn
+ANT_REACH = 32
+
+# Antenna segments in body space (before rotation by dir+90), base -> tip
+antenna_bases = np.array([[-4.0, -14.0], [4.0, -14.0]])
+antenna_tips = np.array([[-10.0, -20.0], [10.0, -20.0]])
+
+# Level-of-detail tiers, chosen from the camera scale
+LOD_PIXEL, LOD_BODY, LOD_FULL = 0, 1, 2
+LOD_BODY_SCALE = 0.6  # below this, ants are single pixels
+LOD_FULL_SCALE = 1.2  # from this up, legs and antennae are drawn too
+
+body_sprites = BodySpriteCache()
+
+def lod_tier(scale):
+    if scale >= LOD_FULL_SCALE:
+        return LOD_FULL
+    if scale >= LOD_BODY_SCALE:
+        return LOD_BODY
+    return LOD_PIXEL
+
+def cull_rect(camera):
+    """Visible world rectangle padded so partially visible ants are still drawn."""
+    return camera.visible_rect(margin=ANT_REACH)
+
+def visible_ants(x, y, camera):
+    """Indices of ants inside the padded visible rectangle."""
+    _, on_screen = camera.apply_many(np.stack([x, y], axis=-1), margin=ANT_REACH * camera.scale)
+    return np.flatnonzero(on_screen)
+
+def limb_segments(x, y, dir, hips, feet):
+    """World-space (M, 2) start/end points for every leg and antenna of the given ants.
+
+    The first 6 * N rows are legs (hip -> foot), the last 2 * N rows antennae.
+    """
+    rad = np.radians(np.asarray(dir) + 90)[:, None]
+    c, s = np.cos(rad), np.sin(rad)
+
+    def place(offsets):
+        px = np.asarray(x)[:, None] + offsets[:, 0] * c - offsets[:, 1] * s
+        py = np.asarray(y)[:, None] + offsets[:, 0] * s + offsets[:, 1] * c
+        return np.stack([px, py], axis=-1).reshape(-1, 2)
+
+    starts = np.concatenate([np.reshape(hips, (-1, 2)), place(antenna_bases)])
+    ends = np.concatenate([np.reshape(feet, (-1, 2)), place(antenna_tips)])
+    return starts, ends
+
+def draw_limbs(surface, camera, x, y, dir, hips, feet):
+    """Build every leg/antenna quad with one vectorized call, then submit them in a tight loop."""
+    if len(x) == 0:
+        return
+    starts, ends = limb_segments(x, y, dir, hips, feet)
+    starts, _ = camera.apply_many(starts)
+    ends, _ = camera.apply_many(ends)
+    thickness = max(1, int(camera.scale * 2))
+
+    rectangles = anti_aliase_line_coords(starts, ends, thickness).tolist()
+
+    legs = 6 * len(x)
+    aapolygon, filled_polygon = pygame.gfxdraw.aapolygon, pygame.gfxdraw.filled_polygon
+    for rectangle in rectangles[:legs]:
+        aapolygon(surface, rectangle, DARK_RED)
+        filled_polygon(surface, rectangle, DARK_RED)
+    for rectangle in rectangles[legs:]:
+        aapolygon(surface, rectangle, FIRE_ANT_RED)
+        filled_polygon(surface, rectangle, FIRE_ANT_RED)
+
+def draw_bodies(surface, camera, x, y, dir, sprites=body_sprites):
+    """Blit cached, pre-rotated body sprites centred on each ant's head."""
+    heads, _ = camera.apply_many(np.stack([x, y], axis=-1))
+    sprites.draw(surface, heads[:, 0], heads[:, 1], dir, camera.scale)
+
+def draw_pixels(surface, camera, x, y, color=DARK_RED):
+    """Write one pixel per ant straight into the surface's pixel array."""
+    points, _ = camera.apply_many(np.stack([x, y], axis=-1))
+    sx, sy = points.astype(np.intp).T
+    width, height = surface.get_size()
+    inside = (sx >= 0) & (sx < width) & (sy >= 0) & (sy < height)
+
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[sx[inside], sy[inside]] = color[:3]
+    del pixels  # unlock the surface
+
+def draw_colony(colony, surface, camera, sprites=body_sprites, tier=None):
+    """Draw every visible ant of an `AntColony` at the level of detail for the camera scale."""
+    tier = lod_tier(camera.scale) if tier is None else tier
+    visible = visible_ants(colony.x, colony.y, camera)
+    x, y, dir = colony.x[visible], colony.y[visible], colony.dir[visible]
+
+    if tier == LOD_PIXEL:
+        draw_pixels(surface, camera, x, y)
+        return
+    if tier == LOD_FULL:
+        draw_limbs(surface, camera, x, y, dir, colony.hip_positions[visible], colony.feet_positions[visible])
+    draw_bodies(surface, camera, x, y, dir, sprites)
+
+def draw_ant(ant, surface, camera, sprites=body_sprites):
+    """Draw a single `Ant` object."""
+    x, y, dir = np.array([ant.x]), np.array([ant.y]), np.array([ant.dir])
+    if visible_ants(x, y, camera).size == 0:
+        return
+    draw_limbs(surface, camera, x, y, dir, np.array([ant.hip_positions]), np.array([ant.feet_positions]))
+    draw_bodies(surface, camera, x, y, dir, sprites)
+
+def draw_border(surface, camera, world_size, border_margin):
+    thickness = max(1, int(camera.scale * border_margin))
+
+    # UL, UR, BR, BL
+    corners, _ = camera.apply_many([
+        (-thickness, -thickness),
+        (world_size[0] + thickness, -thickness),
+        (world_size[0] + thickness, world_size[1] + thickness),
+        (-thickness, world_size[1] + thickness),
+    ])
+
+    corners = anti_aliase_line_coords(corners, np.roll(corners, -1, axis=0), thickness)
+
+    for rectangle in corners:
+        pygame.gfxdraw.aapolygon(surface, rectangle, BLACK)
+        pygame.gfxdraw.filled_polygon(surface, rectangle, BLACK)
@@ -0,0 +1,221 @@
+"""Streaming replay files: per-tick ant state, quantized to int16, delta-encoded and compressed per chunk.
+
+Each tick stores x, y, dir and the six foot positions of every ant. Positions are
+quantized to 1 / `position_scale` world units and headings to 1/65536 of a turn.
+A chunk holds `chunk_ticks` ticks: the first is stored as-is and the rest as
+wrapping int16 deltas against the tick before, then the chunk is zlib-compressed.
+Chunks decode independently, so a player can seek to any chunk without replaying
+the run from the start.
+
+    header   magic b"ANTRPLY\\0", version, ant count, position scale, chunk ticks
+    chunks   (first tick, ticks, compressed size) + compressed payload, repeated
+    index    (first tick, file offset) per chunk, then index offset + magic as footer
+"""
+import struct
+import zlib
+import numpy as np # type: ignore
+from gait import place_legs, hip_offsets
+
+MAGIC = b"ANTRPLY\0"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIQdI")  # magic, version, count, position scale, chunk ticks
+_CHUNK = struct.Struct("<QII")  # first tick, ticks, compressed size
+_INDEX = struct.Struct("<QQ")  # first tick, offset
+_FOOTER = struct.Struct("<QQ8s")  # index offset, chunk count, magic
+
+# Columns per ant per tick: x, y, dir, then 6 feet as x, y
+COLUMNS = 15
+DIR_SCALE = 65536 / 360
+
+class ReplayError(ValueError):
+    pass
+
+def fit_position_scale(world_size, margin: float = 64.0) -> float:
+    """Finest power-of-two position scale at which the world, grown by `margin` units, fits in int16."""
+    return 2.0 ** np.floor(np.log2(32767 / (max(world_size) + margin)))
+
+def quantize(x, y, dir, feet_positions, position_scale: float) -> np.ndarray:
+    """(COLUMNS, N) int16 encoding of one tick."""
+    n = len(x)
+    out = np.empty((COLUMNS, n), dtype=np.int16)
+    pos = np.empty((COLUMNS - 1, n))
+    pos[0], pos[1] = x, y
+    pos[2:] = np.asarray(feet_positions).reshape(n, 12).T
+    pos *= position_scale
+    np.rint(pos, out=pos)
+    if pos.size and (pos.min() < -32768 or pos.max() > 32767):
+        limit = 32767 / position_scale
+        raise ReplayError(f"positions beyond +-{limit:g} world units do not fit at position scale {position_scale:g}")
+    out[0:2] = pos[0:2]
+    out[3:] = pos[2:]
+    # Headings wrap, so store them as uint16 bits
+    out[2] = (np.rint(np.asarray(dir) % 360 * DIR_SCALE).astype(np.int64) % 65536).astype(np.uint16).view(np.int16)
+    return out
+
+class ReplayFrame:
+    """One decoded tick, with the attributes the renderer reads from an `AntColony`."""
+    def __init__(self, tick: int, x: np.ndarray, y: np.ndarray, dir: np.ndarray, feet_positions: np.ndarray) -> None:
+        self.tick = tick
+        self.x = x
+        self.y = y
+        self.dir = dir
+        self.feet_positions = feet_positions
+
+    @property
+    def hip_positions(self) -> np.ndarray:
+        return place_legs(self.x, self.y, self.dir, hip_offsets)
+
+    def __len__(self) -> int:
+        return self.x.shape[0]
+
+class ReplayRecorder:
+    """Append ticks to a replay file as the simulation runs; only one chunk is held in memory.
+
+    Without an explicit `position_scale` it is fitted to `world_size` when given, else 8.
+    """
+    def __init__(
+        self,
+        path: str,
+        count: int,
+        chunk_ticks: int = 64,
+        position_scale: float | None = None,
+        level: int = 6,
+        world_size=None
+    ) -> None:
+        if position_scale is None:
+            position_scale = 8.0 if world_size is None else fit_position_scale(world_size)
+        self.count = count
+        self.chunk_ticks = chunk_ticks
+        self.position_scale = position_scale
+        self.level = level
+
+        self.tick = 0
+        self._pending = []
+        self._index = []
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, count, position_scale, chunk_ticks))
+
+    def record(self, colony) -> None:
+        """Store the current state of `colony` (anything with x, y, dir and feet_positions)."""
+        if len(colony.x) != self.count:
+            raise ReplayError(f"replay was opened for {self.count} ants, got {len(colony.x)}")
+        # Suspended or culled legs are left behind; record them where they would be drawn
+        settled_legs = getattr(colony, "settled_legs", None)
+        feet = colony.feet_positions if settled_legs is None else settled_legs()["feet_positions"]
+        self._pending.append(quantize(colony.x, colony.y, colony.dir, feet, self.position_scale))
+        self.tick += 1
+        if len(self._pending) == self.chunk_ticks:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        block = np.stack(self._pending)
+        # int16 arithmetic wraps, which the decoder's int16 cumsum undoes exactly
+        block[1:] = block[1:] - block[:-1]
+        payload = zlib.compress(block.tobytes(), self.level)
+
+        first = self.tick - len(self._pending)
+        self._index.append((first, self._file.tell()))
+        self._file.write(_CHUNK.pack(first, len(self._pending), len(payload)))
+        self._file.write(payload)
+        self._pending = []
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(_INDEX.pack(*entry))
+        self._file.write(_FOOTER.pack(index_offset, len(self._index), MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> "ReplayRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class ReplayPlayer:
+    """Random access to a replay file by chunk, decoding straight into renderer-ready frames."""
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        raw = self._file.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ReplayError(f"{path}: truncated header")
+        magic, version, self.count, self.position_scale, self.chunk_ticks = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ReplayError(f"{path}: not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"{path}: unsupported replay version {version}")
+        self.chunks = self._read_index()
+
+    def _read_index(self) -> list[tuple[int, int]]:
+        f = self._file
+        end = f.seek(0, 2)
+        if end >= _HEADER.size + _FOOTER.size:
+            f.seek(end - _FOOTER.size)
+            index_offset, chunks, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+            if magic == MAGIC:
+                f.seek(index_offset)
+                return [_INDEX.unpack(f.read(_INDEX.size)) for _ in range(chunks)]
+
+        # No footer (the recorder was not closed): walk the chunk headers instead
+        index, offset = [], _HEADER.size
+        while offset + _CHUNK.size <= end:
+            f.seek(offset)
+            first, ticks, size = _CHUNK.unpack(f.read(_CHUNK.size))
+            if offset + _CHUNK.size + size > end:
+                break
+            index.append((first, offset))
+            offset += _CHUNK.size + size
+        return index
+
+    def __len__(self) -> int:
+        """Number of recorded ticks."""
+        if not self.chunks:
+            return 0
+        first, offset = self.chunks[-1]
+        self._file.seek(offset)
+        return first + _CHUNK.unpack(self._file.read(_CHUNK.size))[1]
+
+    def read_chunk(self, chunk: int) -> list[ReplayFrame]:
+        """Decode every tick of one chunk."""
+        _, offset = self.chunks[chunk]
+        self._file.seek(offset)
+        first, ticks, size = _CHUNK.unpack(self._file.read(_CHUNK.size))
+        block = np.frombuffer(zlib.decompress(self._file.read(size)), dtype=np.int16)
+        block = np.cumsum(block.reshape(ticks, COLUMNS, self.count), axis=0, dtype=np.int16)
+
+        inv = 1 / self.position_scale
+        frames = []
+        for k in range(ticks):
+            q = block[k]
+            feet = (q[3:].T.astype(np.float64) * inv).reshape(self.count, 6, 2)
+            dir = q[2].view(np.uint16) / DIR_SCALE
+            frames.append(ReplayFrame(first + k, q[0] * inv, q[1] * inv, dir, feet))
+        return frames
+
+    def frame(self, tick: int) -> ReplayFrame:
+        """Seek to the chunk holding `tick` and decode it."""
+        firsts = [first for first, _ in self.chunks]
+        chunk = int(np.searchsorted(firsts, tick, side="right")) - 1
+        if chunk < 0 or tick >= len(self):
+            raise IndexError(tick)
+        return self.read_chunk(chunk)[tick - self.chunks[chunk][0]]
+
+    def frames(self, start_chunk: int = 0):
+        """Yield frames in order from `start_chunk`, decoding one chunk at a time."""
+        for chunk in range(start_chunk, len(self.chunks)):
+            yield from self.read_chunk(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "ReplayPlayer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
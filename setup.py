@@ -0,0 +1,82 @@
+"""Build the optional Cython backend in place:
+
+    python setup.py build_ext --inplace
+
+The modules run from the checkout, so the build only covers the extension;
+nothing is installed as generic top-level modules. Without Cython, a C compiler
+or OpenMP support the extension is skipped with a warning and `ant.py` falls
+back to the pure-Python kernels in `to_be_optimized.py`.
+"""
+import sys
+from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+class optional_build_ext(build_ext):
+    """`build_ext` that warns instead of failing when the extension cannot be compiled."""
+    def run(self) -> None:
+        self.failed = set()
+        try:
+            super().run()
+        except PlatformError as error:
+            self._skip(error)
+
+    def build_extension(self, ext) -> None:
+        try:
+            super().build_extension(ext)
+        except (CCompilerError, ExecError, PlatformError) as error:
+            self.failed.add(ext.name)
+            self._skip(error)
+
+    def _built(self) -> list:
+        return [ext for ext in self.extensions if ext.name not in getattr(self, "failed", ())]
+
+    def copy_extensions_to_source(self) -> None:
+        extensions, self.extensions = self.extensions, self._built()
+        try:
+            super().copy_extensions_to_source()
+        finally:
+            self.extensions = extensions
+
+    def get_outputs(self) -> list:
+        extensions, self.extensions = self.extensions, self._built()
+        try:
+            return super().get_outputs()
+        finally:
+            self.extensions = extensions
+
+    def _skip(self, error) -> None:
+        print(f"could not build the compiled backend ({error}); using the pure-Python kernels", file=sys.stderr)
+
+def extensions() -> list:
+    try:
+        from Cython.Build import cythonize # type: ignore
+        import numpy as np # type: ignore
+    except ImportError:
+        print("Cython or numpy not available; skipping the compiled backend", file=sys.stderr)
+        return []
+    # OpenMP for the parallel colony kernel; no fused multiply-add contraction,
+    # so the compiled kernels round exactly like the Python ones
+    if sys.platform == "win32":
+        compile_args, link_args = ["/openmp"], []
+    else:
+        compile_args, link_args = ["-fopenmp", "-ffp-contract=off"], ["-fopenmp"]
+    extension = Extension(
+        "optimized", ["optimized.pyx"],
+        include_dirs=[np.get_include()],
+        extra_compile_args=compile_args,
+        extra_link_args=link_args,
+        define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
+    )
+    return cythonize([extension], language_level=3)
+
+setup(
+    name="ant",
+    version="0.1.0",
+    description="Fire ant simulation",
+    py_modules=[],
+    ext_modules=extensions(),
+    cmdclass={"build_ext": optional_build_ext},
+    install_requires=["numpy", "pygame"],
+    python_requires=">=3.10",
+)
@@ -0,0 +1,76 @@
+"""Headless simulation runner: steps ants without pygame, as fast as the CPU allows.
+
+    python -m sim --ants 10000 --ticks 1000
+"""
+import argparse
+import time
+from ant import Ant, WIDTH, HEIGHT
+from colony import AntColony
+from tiled import TiledSimulation
+from replay import ReplayRecorder
+import rng
+
+def build(ants: int, objects: bool = False, width: int = WIDTH, height: int = HEIGHT, tiles=None):
+    """Create the population: a list of `Ant` if `objects`, a `TiledSimulation` if `tiles`, else an `AntColony`."""
+    if objects:
+        return [Ant(WIDTH=width, HEIGHT=height) for _ in range(ants)]
+    if tiles:
+        return TiledSimulation(ants, tiles=tuple(tiles), WIDTH=width, HEIGHT=height)
+    return AntColony(ants, WIDTH=width, HEIGHT=height)
+
+def step(population) -> None:
+    if isinstance(population, (AntColony, TiledSimulation)):
+        population.step()
+    else:
+        for ant in population:
+            ant.update()
+
+def run(population, ticks: int, recorder: ReplayRecorder | None = None) -> float:
+    """Step `population` for `ticks` ticks and return the achieved ticks per second."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(population)
+        if recorder is not None:
+            recorder.record(population)
+    elapsed = time.perf_counter() - start
+    return ticks / elapsed if elapsed > 0 else float("inf")
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the ant simulation without a window.")
+    parser.add_argument("--ants", type=int, default=1000, help="number of ants")
+    parser.add_argument("--ticks", type=int, default=1000, help="number of ticks to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the per-ant random streams")
+    parser.add_argument("--width", type=int, default=WIDTH)
+    parser.add_argument("--height", type=int, default=HEIGHT)
+    parser.add_argument("--objects", action="store_true", help="step a list of Ant objects instead of an AntColony")
+    parser.add_argument("--tiles", type=int, nargs=2, metavar=("COLS", "ROWS"), default=None,
+                        help="split the world into COLS x ROWS tiles, one worker process each")
+    parser.add_argument("--record", metavar="PATH", default=None, help="record a replay of the run to PATH")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        rng.seed(args.seed)
+
+    if args.record and args.objects:
+        parser.error("--record needs array state; drop --objects")
+
+    population = build(args.ants, args.objects, args.width, args.height, args.tiles)
+    recorder = ReplayRecorder(args.record, args.ants, world_size=(args.width, args.height)) if args.record else None
+    try:
+        tps = run(population, args.ticks, recorder)
+    finally:
+        if isinstance(population, TiledSimulation):
+            population.close()
+        if recorder is not None:
+            recorder.close()
+
+    if args.objects:
+        kind = "Ant objects"
+    elif args.tiles:
+        kind = f"{args.tiles[0]}x{args.tiles[1]} tiles"
+    else:
+        kind = "AntColony"
+    print(f"{args.ants} ants ({kind}), {args.ticks} ticks: {tps:.1f} ticks/s ({tps * args.ants:.0f} ant-ticks/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Simulation on a worker thread, double-buffered so rendering and stepping never wait on each other.
+
+The worker steps the colony in place and, after each tick, copies the fields the
+renderer reads into the back buffer, then swaps front and back by flipping an
+index. Legs are only copied while they are animated, so a zoomed-out view
+publishes just positions and headings (24 bytes per ant).
+The renderer reads whichever buffer is in front for the whole frame. If it is
+still holding the buffer that would be written next, the worker skips that
+publish rather than waiting, so a slow frame only ever sees an older tick.
+
+    sim = SimulationThread(colony, tick_rate=60)
+    sim.start()
+    with sim.front() as frame:
+        draw_colony(frame, screen, camera)
+    sim.close()
+"""
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np # type: ignore
+
+# What `draw_colony` reads from a colony
+RENDER_FIELDS = ("x", "y", "dir", "hip_positions", "feet_positions")
+LEG_FIELDS = ("hip_positions", "feet_positions")
+
+class StateBuffer:
+    """One published copy of the colony's `RENDER_FIELDS`, drawable like an `AntColony`.
+
+    `legs` is False when the legs were not copied because their animation was suspended.
+    """
+    def __init__(self, colony) -> None:
+        self.arrays = {name: np.array(getattr(colony, name)) for name in RENDER_FIELDS}
+        self.legs = True
+        self.tick = 0
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get("arrays", {})
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.arrays["x"])
+
+    def publish(self, colony, tick: int) -> None:
+        gait = getattr(colony, "gait", None)
+        self.legs = gait is None or not gait.suspended
+        for name, array in self.arrays.items():
+            if self.legs or name not in LEG_FIELDS:
+                np.copyto(array, getattr(colony, name))
+        self.tick = tick
+
+class SimulationThread:
+    """Step `colony` (an `AntColony` or `TiledSimulation`) on a background thread at `tick_rate` ticks per second.
+
+    `tick_rate=None` steps as fast as possible. A `recorder` (e.g. a
+    `ReplayRecorder`) is fed every tick from the worker, not just the
+    ones that get drawn.
+    """
+    def __init__(self, colony, tick_rate: float | None = 60, recorder=None) -> None:
+        self.colony = colony
+        self.tick_rate = tick_rate
+        self.recorder = recorder
+        self.tick = 0
+
+        self._buffers = (StateBuffer(colony), StateBuffer(colony))
+        self._front = 0
+        self._reading = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        interval = 1 / self.tick_rate if self.tick_rate else 0.0
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            self.colony.step()
+            self.tick += 1
+            if self.recorder is not None:
+                self.recorder.record(self.colony)
+
+            with self._lock:
+                back = 1 - self._front
+                busy = self._reading == back
+            if not busy:
+                # The renderer only ever picks up the front buffer, so the back one is ours until the swap
+                self._buffers[back].publish(self.colony, self.tick)
+                with self._lock:
+                    self._front = back
+
+            if interval:
+                deadline += interval
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    deadline = time.perf_counter()
+
+    @contextmanager
+    def front(self):
+        """Hold the last completed tick for reading; the worker will not write to it meanwhile."""
+        with self._lock:
+            self._reading = self._front
+            buffer = self._buffers[self._front]
+        try:
+            yield buffer
+        finally:
+            with self._lock:
+                self._reading = None
+
+    def close(self) -> None:
+        """Stop the worker after its current tick."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def __enter__(self) -> "SimulationThread":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,125 @@
+import math
+import numpy as np # type: ignore
+
+class UniformGrid:
+    """Uniform grid over the world for batched neighbor queries.
+
+    Ants are kept sorted by cell between updates. An update re-buckets only the
+    k ants that changed cell: they are sorted on their own and merged back into
+    the others, which stay in order, so a tick costs O(N + k log k) instead of a
+    full sort. Points outside the world are clamped into the border cells.
+    """
+    def __init__(self, world_size: tuple[int | float, int | float], cell_size: int | float) -> None:
+        self.cell_size = float(cell_size)
+        self.cols = max(1, math.ceil(world_size[0] / self.cell_size))
+        self.rows = max(1, math.ceil(world_size[1] / self.cell_size))
+
+        self.points = np.empty((0, 2))
+        self.cx = self.cy = self.cells = np.empty(0, dtype=np.intp)
+        self.order = np.empty(0, dtype=np.intp)
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return self.points.shape[0]
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> bool:
+        """Store new positions, re-bucketing the ants that changed cell. Returns True if any did."""
+        self.points = np.stack([x, y], axis=-1)
+        cx = np.clip((self.points[:, 0] // self.cell_size).astype(np.intp), 0, self.cols - 1)
+        cy = np.clip((self.points[:, 1] // self.cell_size).astype(np.intp), 0, self.rows - 1)
+        cells = cy * self.cols + cx
+
+        if cells.shape != self.cells.shape:
+            self.order = np.argsort(cells, kind="stable")
+        else:
+            moved = np.flatnonzero(cells != self.cells)
+            if moved.size == 0:
+                return False
+            # The others keep their cell, so `order` without the movers is still sorted
+            kept = self.order[cells[self.order] == self.cells[self.order]]
+            moved = moved[np.argsort(cells[moved], kind="stable")]
+            at = np.searchsorted(cells[kept], cells[moved], side="right")
+            self.order = np.insert(kept, at, moved)
+
+        self.cx, self.cy, self.cells = cx, cy, cells
+        counts = np.bincount(cells, minlength=self.cols * self.rows)
+        self.starts[1:] = np.cumsum(counts)
+        return True
+
+    def pairs(self, radius: int | float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All ordered pairs (i, j), i != j, closer than `radius`, with their distances."""
+        n = len(self)
+        ring = max(1, math.ceil(radius / self.cell_size))
+        ids = np.arange(n)
+        found_i, found_j = [], []
+
+        for dy in range(-ring, ring + 1):
+            for dx in range(-ring, ring + 1):
+                nx, ny = self.cx + dx, self.cy + dy
+                valid = (nx >= 0) & (nx < self.cols) & (ny >= 0) & (ny < self.rows)
+                cell = (ny * self.cols + nx)[valid]
+                start = self.starts[cell]
+                count = self.starts[cell + 1] - start
+
+                total = int(count.sum())
+                if total == 0:
+                    continue
+                # Expand every (ant, cell) pair into one row per candidate in that cell
+                first = np.repeat(np.cumsum(count) - count, count)
+                found_i.append(np.repeat(ids[valid], count))
+                found_j.append(self.order[np.repeat(start, count) + np.arange(total) - first])
+
+        if not found_i:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty, np.empty(0)
+
+        i = np.concatenate(found_i)
+        j = np.concatenate(found_j)
+        delta = self.points[i] - self.points[j]
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+
+        keep = (i != j) & (dist < radius)
+        return i[keep], j[keep], dist[keep]
+
+    def query_radius(self, radius: int | float) -> list[np.ndarray]:
+        """Neighbor indices within `radius` for every ant."""
+        i, j, _ = self.pairs(radius)
+        order = np.argsort(i, kind="stable")
+        bounds = np.searchsorted(i[order], np.arange(len(self) + 1))
+        j = j[order]
+        return [j[bounds[k]:bounds[k + 1]] for k in range(len(self))]
+
+    def query_knn(self, k: int, radius: int | float | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """The `k` nearest neighbors of every ant within `radius` (default: one cell).
+
+        Returns (N, k) index and distance arrays, padded with -1 / inf where fewer
+        than `k` neighbors are in range.
+        """
+        radius = self.cell_size if radius is None else radius
+        i, j, dist = self.pairs(radius)
+
+        order = np.lexsort((dist, i))
+        i, j, dist = i[order], j[order], dist[order]
+        rank = np.arange(i.size) - np.searchsorted(i, i)
+        keep = rank < k
+
+        indices = np.full((len(self), k), -1, dtype=np.intp)
+        distances = np.full((len(self), k), np.inf)
+        indices[i[keep], rank[keep]] = j[keep]
+        distances[i[keep], rank[keep]] = dist[keep]
+        return indices, distances
+
+    def separation(self, radius: int | float, strength: int | float = 1.0) -> np.ndarray:
+        """Per-ant (N, 2) push away from neighbors closer than `radius`, fading to 0 at `radius`."""
+        i, j, dist = self.pairs(radius)
+        apart = dist > 0
+        i, j, dist = i[apart], j[apart], dist[apart]
+
+        weight = strength * (1 - dist / radius) / dist
+        push = (self.points[i] - self.points[j]) * weight[:, None]
+
+        n = len(self)
+        return np.stack([
+            np.bincount(i, weights=push[:, 0], minlength=n),
+            np.bincount(i, weights=push[:, 1], minlength=n),
+        ], axis=-1)
@@ -0,0 +1,154 @@
+import math
+from collections import OrderedDict
+import pygame # type: ignore
+import pygame.gfxdraw  # type: ignore
+import numpy as np # type: ignore
+
+# Colors
+FIRE_ANT_RED = (139, 69, 19)  # Reddish-brown for fire ants
+LIGHT_RED = (168, 117, 35)  # Slightly lighter red for shading
+DARK_RED = (120, 40, 15)  # Slightly darker red for shading
+BLACK = (0, 0, 0)  # Color for eyes
+
+# (body, thorax, abdomen) colors
+BODY_PALETTE = (FIRE_ANT_RED, LIGHT_RED, DARK_RED)
+
+def render_body(size: int, palette: tuple = BODY_PALETTE) -> pygame.Surface:
+    """Draw an unrotated ant body on a (2 * size)² canvas with the head centred, facing up."""
+    body, light, dark = palette
+    surface = pygame.Surface((2 * size, 2 * size), pygame.SRCALPHA)
+    x = y = size
+
+    head_radius = size // 6
+    thorax_radius = size // 8
+    petiole_length = size // 12
+    petiole_width = size // 14
+    abdomen_length = size // 2
+    abdomen_width = size // 3
+
+    detail_length = size // 14
+    detail_width = size // 11
+
+    thorax_y = y + head_radius * 3 // 2
+    petiole_y = thorax_y + thorax_radius + petiole_length // 2
+    abdomen_y = petiole_y + petiole_length // 2 + abdomen_length // 2
+    detail1_y = petiole_y - (petiole_length * 4 // 7)
+    detail2_y = petiole_y + (petiole_length * 4 // 7)
+
+    eye_offset = head_radius // 2  # Place eyes more on the sides
+    eye1_x = x - eye_offset - int(head_radius // 2.5)
+    eye2_x = x + eye_offset + int(head_radius // 2.5)
+    eyes_y = y - eye_offset // 2
+
+    ellipses = (
+        (x, y, head_radius, head_radius, body),
+        (x, petiole_y, petiole_width // 2, petiole_length // 2, body),
+        (x, detail1_y, detail_width // 2, detail_length // 2, body),
+        (x, detail2_y, detail_width // 2, detail_length // 2, dark),
+        (x, thorax_y, thorax_radius, thorax_radius, light),
+        (x, abdomen_y, abdomen_width // 2, abdomen_length // 2, dark),
+        (eye1_x, eyes_y, head_radius // 3, head_radius // 3, BLACK),
+        (eye2_x, eyes_y, head_radius // 3, head_radius // 3, BLACK),
+    )
+    for cx, cy, rx, ry, color in ellipses:
+        pygame.gfxdraw.aaellipse(surface, cx, cy, rx, ry, color)
+        pygame.gfxdraw.filled_ellipse(surface, cx, cy, rx, ry, color)
+
+    return surface
+
+class BodySpriteCache:
+    """Pre-rotated body sprites keyed by (quantized angle, quantized scale, palette), LRU-evicted.
+
+    Sprites are only built the first time a key is drawn, so zooming warms just the
+    scales the camera actually stops on. Scales are quantized geometrically
+    (`scale_steps` per doubling), which keeps a zoom animation from creating a new
+    set of sprites every frame.
+    """
+    def __init__(
+        self,
+        angle_steps: int = 72,
+        scale_steps: int = 8,
+        budget_bytes: int = 32 * 1024 * 1024,
+        ss_factor: int = 2
+    ) -> None:
+        self.angle_steps = angle_steps
+        self.scale_steps = scale_steps
+        self.budget_bytes = budget_bytes
+        self.ss_factor = ss_factor
+
+        self._sprites = OrderedDict()
+        self._bases = OrderedDict()
+        self.max_bases = 4
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def angle_index(self, angle: np.ndarray) -> np.ndarray:
+        return np.rint(np.asarray(angle) % 360 * (self.angle_steps / 360)).astype(np.intp) % self.angle_steps
+
+    def scale_index(self, scale: float) -> int:
+        return round(math.log2(scale) * self.scale_steps)
+
+    def get(self, angle_index: int, scale_index: int, palette: tuple = BODY_PALETTE) -> tuple:
+        """Return (sprite, (half_width, half_height)); the sprite's centre is the ant's head."""
+        key = (angle_index, scale_index, palette)
+        entry = self._sprites.get(key)
+        if entry is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self._build(angle_index, scale_index, palette)
+        self._sprites[key] = entry
+        self.bytes += entry[0].get_width() * entry[0].get_height() * 4
+
+        while self.bytes > self.budget_bytes and len(self._sprites) > 1:
+            _, (old, _) = self._sprites.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * 4
+        return entry
+
+    def _build(self, angle_index: int, scale_index: int, palette: tuple) -> tuple:
+        scale = 2 ** (scale_index / self.scale_steps)
+        size = max(1, int(20 * scale))
+
+        # The unrotated supersampled body is shared by every angle at this scale
+        base = self._bases.get((scale_index, palette))
+        if base is None:
+            base = self._bases[(scale_index, palette)] = render_body(size * self.ss_factor, palette)
+            if len(self._bases) > self.max_bases:
+                self._bases.popitem(last=False)
+        else:
+            self._bases.move_to_end((scale_index, palette))
+
+        # Body-space rotation is dir+90 clockwise on screen; pygame rotates counter-clockwise
+        angle = angle_index * 360 / self.angle_steps
+        rotated = pygame.transform.rotate(base, -angle)
+        sprite = pygame.transform.smoothscale(
+            rotated, (max(1, rotated.get_width() // self.ss_factor), max(1, rotated.get_height() // self.ss_factor))
+        )
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        return sprite, (sprite.get_width() / 2, sprite.get_height() / 2)
+
+    def clear(self) -> None:
+        self._sprites.clear()
+        self._bases.clear()
+        self.bytes = 0
+
+    def draw(self, surface, screen_x, screen_y, dir, scale, palette: tuple = BODY_PALETTE) -> None:
+        """Blit bodies for the given screen positions and headings with one batched `blits` call."""
+        if len(screen_x) == 0:
+            return
+        scale_index = self.scale_index(scale)
+        angles, inverse = np.unique(self.angle_index(np.asarray(dir) + 90), return_inverse=True)
+        entries = [self.get(int(a), scale_index, palette) for a in angles]
+
+        blits = []
+        for x, y, k in zip(screen_x.tolist(), screen_y.tolist(), inverse.tolist()):
+            sprite, (hw, hh) = entries[k]
+            blits.append((sprite, (x - hw, y - hh)))
+        surface.blits(blits, doreturn=False)
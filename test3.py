@@ -4,7 +4,7 @@ from PIL import Image, ImageTk
 import math
 import time
 import threading
-import queue
+from framering import FrameRing
 
 # Initialize Pygame
 pygame.init()
@@ -39,6 +39,14 @@ top_bar.pack(fill="x", side="top")
 tk_label = tk.Label(root)
 tk_label.pack(fill="both", expand=True)
 
+# Size of the label, tracked on the Tk thread so the pygame thread never calls into Tk
+view_size = (800, 600)
+def on_label_configure(event):
+    global view_size
+    view_size = (event.width, event.height)
+
+tk_label.bind("<Configure>", on_label_configure)
+
 # Shared state for FPS and other configuration
 config = {
     "fps": 60,  # Adjust FPS to be lower for smoother performance
@@ -136,16 +144,15 @@ info_btn.pack(side="left", padx=5)
 # Global time tracking for delta time
 last_time = time.time()
 
-# Create a Queue instance for communication between threads
-surface_queue = queue.Queue()
+# Rendered frames go from the pygame thread to Tk through a ring of reused buffers
+frames = FrameRing()
 
 # Flag to stop the worker thread gracefully
 stop_thread = False
 
 # Function to resize the Pygame surface when the Tkinter window is resized
 def resize_pygame_surface():
-    new_width = root.winfo_width()
-    new_height = root.winfo_height() - top_bar.winfo_height()
+    new_width, new_height = view_size
     global screen
     if new_width > 0 and new_height > 0:  # Ensure dimensions are positive
         if screen.get_size() != (new_width, new_height):
@@ -191,64 +198,32 @@ def update_pygame_surface():
     # Increment angle for continuous rotation
     angle += config["rotation_speed"] * dt
 
-    # Put the updated surface in the queue to be processed by Tkinter
-    #_surface = pygame.image.tostring(screen, "RGB")
-    #surface_queue.put(_surface)
+    # Hand the frame to Tkinter: one copy into a reused buffer, older unshown frames are dropped
+    frames.write(screen)
 
-def load_and_process_image():
-    global stop_thread
-    while not stop_thread:
-        try:
-            global screen
-
-            # Convert the surface to a format Tkinter can display
-            pixels = pygame.image.tostring(screen, "RGB")
-            pil_image = Image.frombytes("RGB", screen.get_size(), pixels)
-            photo = ImageTk.PhotoImage(image=pil_image)
-            
-            # Put the processed image in the queue
-            surface_queue.put(photo)
-            time.sleep(1 / 120)  # Control FPS
-        except Exception as e:
-            print(f"Error in game loop: {e}")
-            stop_thread = True  # Stop the thread if an error occurs
-    """ Function to load and process an image in the background """
-
-last_update_time = 0
-update_interval = 1 / 60  # Limit to 60 updates per second
+# One PhotoImage, reused for every frame of the same size
+photo = None
 
-# Function to update the Tkinter label with the Pygame surface
+# Function to update the Tkinter label with the Pygame surface (runs on the Tk thread)
 def update_tkinter_display():
-    global last_update_time
-
-    current_time = time.time()
-    if current_time - last_update_time < update_interval:
-        return  # Skip the update if it hasn't been long enough
-
-    last_update_time = current_time
-
-    try:
-        # Check if the queue has an image to display
-        if not surface_queue.empty():
-            photo = surface_queue.get_nowait()
+    global photo
+
+    frame = frames.take()
+    if frame is not None:
+        pixels, size, mode = frame
+        # Decodes the raw BGRX/RGB bytes into a new RGB image (PIL only shares memory when
+        # mode == rawmode); that decode and paste are the two copies on the Tk side
+        image = Image.frombuffer("RGB", size, pixels, "raw", mode, pixels.shape[1], 1)
+        if photo is None or (photo.width(), photo.height()) != size:
+            photo = ImageTk.PhotoImage(image=image)
             tk_label.configure(image=photo)
             tk_label.image = photo  # Keep a reference to prevent garbage collection
-    except queue.Empty:
-        pass  # If the queue is empty, nothing to do
+        else:
+            photo.paste(image)
 
     # Call this function again after a delay to update the display
-    root.after(1000 // config["fps"], update_tkinter_display)
-
-# Function to start the worker thread that updates the Pygame surface
-def tkinter_loop():
-    global stop_thread
-    while not stop_thread:
-        try:
-            update_tkinter_display()
-            time.sleep(1 / config["fps"] / 2)  # Control FPS
-        except Exception as e:
-            print(f"Error in game loop: {e}")
-            stop_thread = True  # Stop the thread if an error occurs
+    if not stop_thread:
+        root.after(max(1, 1000 // config["fps"]), update_tkinter_display)
 
 def pygame_loop():
     global stop_thread
@@ -271,11 +246,9 @@ def on_closing():
 # Initialize the screen surface for rendering before starting the game loop
 screen = pygame.Surface((800, 600), pygame.SRCALPHA)  # Make sure screen is initialized here
 
-# Start a separate thread to run the game loop
-threading.Thread(target=tkinter_loop, daemon=True).start()
+# Start a separate thread to run the game loop; the display is refreshed from Tk's own loop
 threading.Thread(target=pygame_loop, daemon=True).start()
-
-threading.Thread(target=load_and_process_image, daemon=True).start()
+root.after(0, update_tkinter_display)
 
 # Set up closing event for the Tkinter window
 root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,24 @@
+import numpy as np # type: ignore
+
+import checkpoint
+from colony import AntColony
+from rng import AntStreams
+
+def test_loaded_checkpoint_continues_the_run(tmp_path):
+    path = tmp_path / "colony.ckpt"
+    colony = AntColony(100, streams=AntStreams(11))
+    for _ in range(200):
+        colony.step()
+    checkpoint.save(path, colony, tick=200)
+    for _ in range(500):
+        colony.step()
+
+    restored, tick, streams = checkpoint.load(path)
+    assert tick == 200
+    assert streams is not colony.streams
+    for _ in range(500):
+        restored.step()
+    for name in ("x", "y", "dir", "target", "draws", "hip_positions", "feet_positions"):
+        assert np.array_equal(getattr(restored, name), getattr(colony, name)), name
+    # New ants carry on from the saved stream ids
+    assert np.array_equal(AntColony(3, streams=streams).stream, [100, 101, 102])
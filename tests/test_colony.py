@@ -0,0 +1,17 @@
+import numpy as np # type: ignore
+
+import rng
+from colony import AntColony
+
+def test_adopted_state_is_updated_in_place(monkeypatch):
+    # Shared-memory and memory-mapped state must see every tick without copying back
+    monkeypatch.setattr("colony.colony_step", None)
+    rng.seed(5)
+    state = AntColony(50).state()
+    colony = AntColony.from_state(state, copy=False)
+    before = {name: array.copy() for name, array in state.items()}
+    colony.step()
+    for name in state:
+        assert getattr(colony, name) is state[name], name
+    for name in ("x", "y", "dir", "hip_positions"):
+        assert not np.array_equal(state[name], before[name]), name
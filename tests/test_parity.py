@@ -0,0 +1,75 @@
+"""The pure-Python, NumPy and Cython backends must step seeded ants identically.
+
+The Cython cases are skipped when the extension is not built (`python setup.py build_ext --inplace`).
+"""
+import numpy as np # type: ignore
+import pytest
+
+try:
+    import optimized # type: ignore
+except ImportError:
+    optimized = None
+
+import ant
+import bench
+import colony
+import rng
+from colony import AntColony
+
+ANTS = 40
+TICKS = 600
+
+compiled = pytest.mark.skipif(optimized is None, reason="Cython extension not built")
+
+def stepped_colony(monkeypatch, kernel, culled: bool = False) -> AntColony:
+    """A seeded colony stepped TICKS times with `kernel` as the compiled colony kernel (None: NumPy).
+
+    `culled` pans a view across the world and suspends the legs for a while, as the renderer does.
+    """
+    monkeypatch.setattr(colony, "colony_step", kernel)
+    rng.seed(bench.SEED)
+    population = AntColony(ANTS)
+    for tick in range(TICKS):
+        if culled:
+            left = tick % 500
+            population.view = (left, 100, left + 250, 400)
+            population.animate_feet(not 200 <= tick < 300)
+        population.step()
+    return population
+
+def stepped_ants(cls) -> list:
+    rng.seed(bench.SEED)
+    ants = [cls() for _ in range(ANTS)]
+    for _ in range(TICKS):
+        for a in ants:
+            a.update()
+    return ants
+
+@compiled
+def test_python_and_cython_ants_match_exactly():
+    # Each backend is picked at import time, so each runs in its own interpreter
+    assert bench.parity(ANTS, TICKS)
+
+@compiled
+@pytest.mark.parametrize("culled", [False, True], ids=["all", "culled"])
+def test_numpy_colony_matches_compiled_colony(monkeypatch, culled):
+    compiled = stepped_colony(monkeypatch, optimized.colony_step, culled)
+    numpy = stepped_colony(monkeypatch, None, culled)
+
+    for name in colony.STATE_FIELDS:
+        np.testing.assert_array_equal(getattr(numpy, name), getattr(compiled, name), err_msg=name)
+
+@pytest.mark.parametrize("kernel", ["numpy", pytest.param("compiled", marks=compiled)])
+@pytest.mark.parametrize("cls", [ant.PythonAnt, ant.Ant], ids=["PythonAnt", "Ant"])
+def test_colony_matches_ant_objects(monkeypatch, kernel, cls):
+    population = stepped_colony(monkeypatch, None if kernel == "numpy" else optimized.colony_step)
+    ants = stepped_ants(cls)
+
+    close = dict(rtol=0, atol=1e-9)
+    np.testing.assert_allclose(population.x, [a.x for a in ants], **close)
+    np.testing.assert_allclose(population.y, [a.y for a in ants], **close)
+    np.testing.assert_allclose(population.dir, [a.dir for a in ants], **close)
+    np.testing.assert_allclose(population.hip_positions, [a.hip_positions for a in ants], **close)
+    np.testing.assert_allclose(population.feet_positions, [a.feet_positions for a in ants], **close)
+    np.testing.assert_array_equal(population.feet_frames, [a.feet_frames for a in ants])
+    np.testing.assert_array_equal(population.draws, [a.draws for a in ants])
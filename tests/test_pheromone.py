@@ -0,0 +1,22 @@
+import numpy as np # type: ignore
+
+import rng
+from colony import AntColony
+from pheromone import PheromoneField
+
+def test_isolated_ant_reaches_its_target():
+    # Its own trail lies behind it and must not pull it round in circles
+    colony = AntColony(1, x=[375.0], y=[250.0], dir=[0.0], target=[(700, 250)], pheromones=PheromoneField((750, 500)))
+    for _ in range(1000):
+        colony.step()
+        if colony.draws[0] > 1:
+            break
+    assert colony.draws[0] > 1
+
+def test_trails_leave_targets_alone():
+    rng.seed(3)
+    colony = AntColony(200, pheromones=PheromoneField((750, 500)))
+    target = colony.target.copy()
+    heading = colony.pheromones.steer_targets(colony.x, colony.y, colony.dir, colony.target)
+    assert np.array_equal(colony.target, target)
+    assert heading.shape == target.shape
@@ -0,0 +1,61 @@
+import numpy as np # type: ignore
+import pytest
+
+import rng
+from colony import AntColony
+from replay import ReplayError, ReplayPlayer, ReplayRecorder, fit_position_scale, quantize
+
+WORLD = (750, 500)
+
+def record(path, ticks, chunk_ticks=16):
+    rng.seed(3)
+    colony = AntColony(30, WIDTH=WORLD[0], HEIGHT=WORLD[1])
+    states = []
+    with ReplayRecorder(path, len(colony), chunk_ticks=chunk_ticks, world_size=WORLD) as recorder:
+        for _ in range(ticks):
+            colony.step()
+            recorder.record(colony)
+            states.append((colony.x.copy(), colony.y.copy(), colony.feet_positions.copy()))
+    return recorder.position_scale, states
+
+def test_quantization_error_is_within_one_step(tmp_path):
+    scale, states = record(tmp_path / "run.rpl", 50)
+    with ReplayPlayer(tmp_path / "run.rpl") as player:
+        frames = list(player.frames())
+    assert len(frames) == 50
+    for frame, (x, y, feet) in zip(frames, states):
+        assert np.abs(frame.x - x).max() <= 1 / scale
+        assert np.abs(frame.y - y).max() <= 1 / scale
+        assert np.abs(frame.feet_positions - feet).max() <= 1 / scale
+
+def test_frame_seeks_across_chunks(tmp_path):
+    record(tmp_path / "run.rpl", 50)
+    with ReplayPlayer(tmp_path / "run.rpl") as player:
+        frames = list(player.frames())
+        assert len(player) == 50 and len(player.chunks) == 4
+        for tick in (49, 0, 16, 15, 33):
+            frame = player.frame(tick)
+            assert frame.tick == tick
+            assert np.array_equal(frame.x, frames[tick].x)
+        with pytest.raises(IndexError):
+            player.frame(50)
+
+def test_index_is_rebuilt_without_footer(tmp_path):
+    path = tmp_path / "run.rpl"
+    record(path, 50)
+    with ReplayPlayer(path) as player:
+        chunks = player.chunks
+        last = player.frame(49)
+    # Cut off the index and footer, as if the recorder never closed
+    data = path.read_bytes()
+    path.write_bytes(data[:chunks[-1][1]] + data[chunks[-1][1]:-(16 * len(chunks) + 24)])
+    with ReplayPlayer(path) as player:
+        assert player.chunks == chunks
+        assert np.array_equal(player.frame(49).x, last.x)
+
+def test_quantize_rejects_positions_out_of_range():
+    scale = fit_position_scale(WORLD)
+    feet = np.zeros((1, 6, 2))
+    quantize([WORLD[0] + 64], [0.0], [0.0], feet, scale)
+    with pytest.raises(ReplayError):
+        quantize([32768 / scale], [0.0], [0.0], feet, scale)
@@ -0,0 +1,30 @@
+import multiprocessing as mp
+
+import numpy as np # type: ignore
+import pytest
+
+import rng
+from colony import AntColony
+from tiled import TiledSimulation
+
+def test_tiles_match_one_colony():
+    rng.seed(7)
+    colony = AntColony(300)
+    rng.seed(7)
+    with TiledSimulation(300, tiles=(2, 2)) as tiled:
+        for _ in range(50):
+            colony.step()
+            tiled.step()
+        for name in ("x", "y", "dir", "draws"):
+            assert np.array_equal(getattr(tiled, name), getattr(colony, name)), name
+
+@pytest.mark.skipif(mp.get_start_method() != "fork", reason="the failing step is patched in before the workers fork")
+def test_failing_worker_raises_instead_of_hanging(monkeypatch):
+    def fail(self):
+        raise ValueError("worker step failed")
+    monkeypatch.setattr(AntColony, "step", fail)
+    with TiledSimulation(100, tiles=(2, 1)) as tiled:
+        with pytest.raises(RuntimeError, match="worker step failed"):
+            tiled.step()
+        with pytest.raises(RuntimeError, match="worker step failed"):
+            tiled.step()
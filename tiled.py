@@ -0,0 +1,236 @@
+"""Multi-process simulation: the world is split into tiles, each stepped by its own worker process.
+
+All per-ant state lives in `multiprocessing.shared_memory` blocks. Every tick each
+worker steps the ants currently owned by its tile and writes back their state and
+their new owner, so ants that walked over a tile border are handed to the
+neighbouring worker on the next tick. Each tile's ants are kept in a sorted id
+list; a tick only exchanges the ids of the border crossers, so no worker ever
+scans the whole population. The parent process never touches the ants; between
+ticks it can read the shared arrays to render. A worker that fails breaks the
+tick barriers, and the parent raises its traceback from `step`.
+"""
+import multiprocessing as mp
+import os
+import threading
+import traceback
+from multiprocessing import shared_memory
+import numpy as np # type: ignore
+from ant import WIDTH, HEIGHT
+from colony import AntColony, STATE_FIELDS
+from rng import AntStreams, streams as shared_streams
+
+def tile_index(x: np.ndarray, y: np.ndarray, world_size: tuple, tiles: tuple[int, int]) -> np.ndarray:
+    """Tile id (row-major over a `tiles` = (columns, rows) grid) of each point, clamped to the world."""
+    cols, rows = tiles
+    col = np.clip((np.asarray(x) * (cols / world_size[0])).astype(np.intp), 0, cols - 1)
+    row = np.clip((np.asarray(y) * (rows / world_size[1])).astype(np.intp), 0, rows - 1)
+    return row * cols + col
+
+class SharedColonyState:
+    """`STATE_FIELDS` arrays for `count` ants plus per-tile membership lists, in shared memory.
+
+    `members[t % 2]` holds every ant id grouped by owner tile during tick t, tile k's
+    ids (in increasing order) at `members[t % 2][ranges[t % 2][k]:ranges[t % 2][k + 1]]`;
+    the lists for tick t + 1 are built in the other buffer.
+    """
+    def __init__(self, count: int, tiles: int = 1, names: dict[str, str] | None = None) -> None:
+        self.count = count
+        self.owned = names is None
+        self._blocks = {}
+        self.arrays = {}
+
+        fields = {name: ((count,) + shape, dtype) for name, (shape, dtype) in STATE_FIELDS.items()}
+        fields["owner"] = ((count,), np.int32)
+        fields["members"] = ((2, count), np.int64)
+        fields["ranges"] = ((2, tiles + 1), np.int64)
+        # Per tile: how many of its ants stayed, i.e. where its leavers start in its range
+        fields["stay"] = ((tiles,), np.int64)
+        for name, (full, dtype) in fields.items():
+            nbytes = max(1, int(np.prod(full)) * np.dtype(dtype).itemsize)
+            if self.owned:
+                block = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=names[name])
+            self._blocks[name] = block
+            self.arrays[name] = np.ndarray(full, dtype=dtype, buffer=block.buf)
+
+    @property
+    def names(self) -> dict[str, str]:
+        return {name: block.name for name, block in self._blocks.items()}
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get("arrays", {})
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def gather(self, index: np.ndarray) -> dict[str, np.ndarray]:
+        return {name: self.arrays[name][index] for name in STATE_FIELDS}
+
+    def scatter(self, index: np.ndarray, state: dict[str, np.ndarray]) -> None:
+        for name in STATE_FIELDS:
+            self.arrays[name][index] = state[name]
+
+    def close(self) -> None:
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            if self.owned:
+                block.unlink()
+        self._blocks.clear()
+
+def _worker(tile, names, count, world_size, tiles, key, tick, start, handoff, done, stop, errors) -> None:
+    workers = tiles[0] * tiles[1]
+    state = SharedColonyState(count, workers, names)
+    # Ants carry their stream ids and draw counters, so every worker shares the same streams
+    streams = AntStreams.from_key(key)
+    # Share the cores between the workers instead of every worker starting one OpenMP thread per core
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    try:
+        while True:
+            start.wait()
+            if stop.value:
+                break
+            members, ranges = state.members[tick.value % 2], state.ranges[tick.value % 2]
+            begin, end = ranges[tile], ranges[tile + 1]
+            index = members[begin:end].copy()
+            stayers = index
+            if index.size:
+                local = AntColony.from_state(
+                    state.gather(index), copy=False, WIDTH=world_size[0], HEIGHT=world_size[1], streams=streams,
+                    threads=threads,
+                )
+                local.step()
+                state.scatter(index, local.state())
+
+                owner = tile_index(local.x, local.y, world_size, tiles)
+                state.owner[index] = owner
+                leave = owner != tile
+                stayers = index[~leave]
+                # Publish the ants that crossed a border after the ones that stayed
+                members[begin:begin + stayers.size] = stayers
+                members[begin + stayers.size:end] = index[leave]
+            state.stay[tile] = stayers.size
+            handoff.wait()
+
+            # Only border crossers move between lists
+            leavers = np.concatenate([members[ranges[k] + state.stay[k]:ranges[k + 1]] for k in range(workers)])
+            destination = state.owner[leavers]
+            sizes = state.stay + np.bincount(destination, minlength=workers)
+            new_ranges = np.zeros(workers + 1, dtype=np.int64)
+            np.cumsum(sizes, out=new_ranges[1:])
+
+            arrivals = np.sort(leavers[destination == tile])
+            merged = np.insert(stayers, np.searchsorted(stayers, arrivals), arrivals)
+            state.members[(tick.value + 1) % 2][new_ranges[tile]:new_ranges[tile + 1]] = merged
+            if tile == 0:
+                state.ranges[(tick.value + 1) % 2] = new_ranges
+            done.wait()
+    except threading.BrokenBarrierError:
+        pass  # Another worker failed
+    except BaseException:
+        errors.put(f"tile {tile}: {traceback.format_exc()}")
+        for barrier in (start, handoff, done):
+            barrier.abort()
+    finally:
+        state.close()
+
+class TiledSimulation:
+    """An ant colony stepped by one worker process per tile, with state in shared memory.
+
+    Exposes `x`, `y`, `dir`, `hip_positions`, `feet_positions`, ... like an
+    `AntColony`, so the renderer can draw it directly between ticks.
+    """
+    def __init__(
+        self,
+        count: int,
+        tiles: tuple[int, int] = (2, 2),
+        WIDTH: int = WIDTH,
+        HEIGHT: int = HEIGHT,
+        seed: int | None = None
+    ) -> None:
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
+        self.tiles = tiles
+        workers = tiles[0] * tiles[1]
+        self.state = SharedColonyState(count, workers)
+
+        streams = shared_streams if seed is None else AntStreams(seed)
+        self.streams = streams
+        colony = AntColony(count, WIDTH=WIDTH, HEIGHT=HEIGHT, streams=streams)
+        self.state.scatter(slice(None), colony.state())
+        owner = tile_index(colony.x, colony.y, (WIDTH, HEIGHT), tiles)
+        self.state.owner[:] = owner
+        self.state.members[0] = np.argsort(owner, kind="stable")
+        np.cumsum(np.bincount(owner, minlength=workers), out=self.state.ranges[0, 1:])
+        self.state.ranges[0, 0] = 0
+
+        ctx = mp.get_context()
+        self._tick = ctx.Value("q", 0, lock=False)
+        self._stop = ctx.Value("b", 0, lock=False)
+        self._start = ctx.Barrier(workers + 1)
+        self._handoff = ctx.Barrier(workers)
+        self._done = ctx.Barrier(workers + 1)
+        self._errors = ctx.SimpleQueue()
+        self._error = None
+
+        self._workers = [
+            ctx.Process(
+                target=_worker,
+                args=(tile, self.state.names, count, (WIDTH, HEIGHT), tiles, int(streams.key),
+                      self._tick, self._start, self._handoff, self._done, self._stop, self._errors),
+                daemon=True,
+            )
+            for tile in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __getattr__(self, name):
+        state = self.__dict__.get("state")
+        if state is not None and name in state.arrays:
+            return state.arrays[name]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    def step(self) -> None:
+        """Run one tick on every worker and wait for all of them to finish.
+
+        Raises RuntimeError with the worker's traceback if one of them failed.
+        """
+        try:
+            self._start.wait()
+            self._done.wait()
+        except threading.BrokenBarrierError:
+            if self._error is None:
+                self._error = self._errors.get() if not self._errors.empty() else "tile worker stopped"
+            raise RuntimeError(f"tiled simulation failed in {self._error}") from None
+        self._tick.value += 1
+
+    def owners(self) -> np.ndarray:
+        """Current tile of every ant."""
+        return self.state.owner
+
+    def close(self) -> None:
+        if not self._workers:
+            return
+        self._stop.value = 1
+        try:
+            self._start.wait()
+        except threading.BrokenBarrierError:
+            pass  # The workers already stopped on a failure
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self.state.close()
+
+    def __enter__(self) -> "TiledSimulation":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
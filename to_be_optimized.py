@@ -35,9 +35,8 @@ def left_right(
         # Compute the cross product
         cross_product = vector_P1_P2[0] * vector_P1_P3[1] - vector_P1_P2[1] * vector_P1_P3[0]
     
-        # Determine the direction based on the cross product
-        if abs(cross_product) < 5:
-            pass
+        # Determine the direction based on the cross product. There is no dead zone:
+        # ignoring targets a few units off the heading makes ants overshoot them
         if cross_product > 0:
             right = True
         elif cross_product < 0:
@@ -66,3 +65,82 @@ def turn(
 
         ant.dir += ant.rotation_speed
         ant.dir %= 360
+
+def left_right_many(
+        x: np.ndarray,
+        y: np.ndarray,
+        targets: np.ndarray,
+        dir: np.ndarray,
+        avoid: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """`left_right` for arrays of ants; `avoid` is an optional (N, 2) steering push."""
+        rad = np.radians(dir)
+        c, s = np.cos(rad), np.sin(rad)
+        dx, dy = targets[:, 0] - x, targets[:, 1] - y
+        cross = c * dy - s * dx
+
+        if avoid is not None:
+            # Weigh the push against the unit direction to the target, not its raw distance
+            cross = cross / np.maximum(np.hypot(dx, dy), 1e-9) + (c * avoid[:, 1] - s * avoid[:, 0])
+
+        return cross < 0, cross > 0
+
+def turn_many(
+        dir: np.ndarray,
+        rotation_speed: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        max_rotation_speed: int | float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """`turn` for arrays of ants; returns the new (dir, rotation_speed)."""
+        rs = rotation_speed
+        settled = np.sign(rs) * np.maximum(np.abs(rs) - 0.75, 0.0)
+        rs = np.where(left & ~right, np.maximum(rs - 0.75, -max_rotation_speed),
+             np.where(right & ~left, np.minimum(rs + 0.75, max_rotation_speed),
+             np.where(left, rs, settled)))
+
+        return (dir + rs) % 360, rs
+
+def anti_aliase_line_coords(
+        points1: np.ndarray,
+        points2: np.ndarray,
+        thickness: int | float = 1.0
+    ) -> np.ndarray:
+        points1 = np.asarray(points1)
+        points2 = np.asarray(points2)
+
+        delta = points1 - points2
+        length = np.linalg.norm(delta, axis=1)
+        angle = np.arctan2(delta[:, 1], delta[:, 0])
+        center = (points1 + points2) / 2.0
+
+        # Precompute sin and cos for angles
+        cos_a = np.cos(angle)
+        sin_a = np.sin(angle)
+
+        half_len = length / 2.0
+        half_thick = thickness / 2.0
+
+        # Vectorized offset components for each corner
+        dx_l = half_len * cos_a
+        dy_l = half_len * sin_a
+        dx_t = half_thick * sin_a
+        dy_t = half_thick * cos_a
+
+        # Compute all corners in bulk (shape: [N, 4, 2])
+        UL = np.stack([center[:, 0] + dx_l - dx_t,
+                       center[:, 1] + dy_t + dy_l], axis=-1)
+
+        UR = np.stack([center[:, 0] - dx_l - dx_t,
+                       center[:, 1] + dy_t - dy_l], axis=-1)
+
+        BR = np.stack([center[:, 0] - dx_l + dx_t,
+                       center[:, 1] - dy_t - dy_l], axis=-1)
+
+        BL = np.stack([center[:, 0] + dx_l + dx_t,
+                       center[:, 1] - dy_t + dy_l], axis=-1)
+
+        # Combine all into a single array: shape [N, 4, 2]
+        rectangles = np.stack([UL, UR, BR, BL], axis=1)
+
+        return rectangles